@@ -3,9 +3,26 @@
 Detailed scan of the specific workspace for chat data
 """
 import os
+import re
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Single C-level scan over all keys instead of a Python loop per key
+CHAT_KEY_PATTERN = re.compile(r'chat|conversation|building')
+
+
+def load_json_bytes(raw):
+    """Parse JSON bytes with orjson when available, stdlib json otherwise"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 appdata = os.getenv('APPDATA')
 workspace_id = '0cd3ede1a5c7331b4b8db62309a7af8c'
 workspace_dir = Path(appdata) / "Cursor" / "User" / "workspaceStorage" / workspace_id
@@ -82,17 +99,17 @@ if cursor_retri.exists():
             # Try to read JSON files
             if f.suffix == '.json' and size < 1000000:  # Less than 1MB
                 try:
-                    with open(f, 'r', encoding='utf-8') as jf:
-                        data = json.load(jf)
-                        if isinstance(data, dict):
-                            keys = list(data.keys())[:10]
-                            print(f"    Keys: {keys}")
-                            # Check for chat-related content
-                            if any('chat' in str(k).lower() or 'conversation' in str(k).lower() or 'building' in str(k).lower() for k in data.keys()):
-                                print(f"    *** CHAT-RELATED DATA FOUND ***")
-                                # Show relevant keys
-                                relevant = [k for k in data.keys() if 'chat' in str(k).lower() or 'conversation' in str(k).lower() or 'building' in str(k).lower()]
-                                print(f"    Relevant keys: {relevant}")
+                    data = load_json_bytes(f.read_bytes())
+                    if isinstance(data, dict):
+                        keys = list(data.keys())[:10]
+                        print(f"    Keys: {keys}")
+                        # Check for chat-related content
+                        joined_keys = '\n'.join(map(str, data)).lower()
+                        if CHAT_KEY_PATTERN.search(joined_keys):
+                            print(f"    *** CHAT-RELATED DATA FOUND ***")
+                            # Show relevant keys (only computed on a hit)
+                            relevant = [k for k in data if CHAT_KEY_PATTERN.search(str(k).lower())]
+                            print(f"    Relevant keys: {relevant}")
                 except:
                     pass
     except Exception as e:
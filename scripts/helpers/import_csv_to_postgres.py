@@ -31,17 +31,17 @@ def detect_csv_columns(csv_path: str, sample_rows: int = 10) -> Dict:
         elif '\t' in sample:
             delimiter = '\t'
         
-        reader = csv.DictReader(f, delimiter=delimiter)
+        reader = csv.reader(f, delimiter=delimiter)
         
         # Get columns
-        columns = reader.fieldnames or []
+        columns = next(reader, [])
         
-        # Read sample rows
+        # Read sample rows (only the sampled rows are turned into dicts)
         sample_data = []
         row_count = 0
         for i, row in enumerate(reader):
             if i < sample_rows:
-                sample_data.append(row)
+                sample_data.append(dict(zip(columns, row)))
             row_count += 1
             if i >= sample_rows:
                 # Count remaining rows
@@ -114,50 +114,82 @@ def import_csv_data(cursor, table_name: str, csv_path: str, csv_info: Dict, batc
         table_name: Target table name
         csv_path: Path to CSV file
         csv_info: Dict from detect_csv_columns()
+    
+    Returns:
+        (rows read from the CSV, rows the server reported inserted)
     """
     from psycopg2.extras import execute_values
     
+    # Column lists and INSERT statement are fixed for the whole import
+    orig_cols = csv_info['columns']
+    column_names = [col.strip().replace(' ', '_').replace('-', '_') for col in orig_cols]
+    insert_sql = f"""
+        INSERT INTO {table_name} ({', '.join(f'"{col}"' for col in column_names)})
+        VALUES %s
+    """
+    
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f, delimiter=csv_info['delimiter'])
+        reader = csv.reader(f, delimiter=csv_info['delimiter'])
         
-        # Get column names (cleaned)
-        column_names = [col.strip().replace(' ', '_').replace('-', '_') for col in csv_info['columns']]
+        # Map each column to its position in the header once
+        header = next(reader, [])
+        col_indexes = [header.index(col) for col in orig_cols]
         
         batch = []
-        total_imported = 0
+        total_read = 0
+        total_inserted = 0
         
         for row in reader:
-            # Clean column names in row
-            cleaned_row = {}
-            for orig_col, clean_col in zip(csv_info['columns'], column_names):
-                cleaned_row[clean_col] = row.get(orig_col, '')
-            
-            # Prepare values tuple
-            values = tuple(cleaned_row.get(col, '') for col in column_names)
-            batch.append(values)
+            # Values in column order, read positionally (short rows padded with '')
+            row_len = len(row)
+            batch.append(tuple(row[i] if i < row_len else '' for i in col_indexes))
             
             if len(batch) >= batch_size:
-                # Insert batch
-                placeholders = ','.join(['%s'] * len(column_names))
-                insert_sql = f"""
-                    INSERT INTO {table_name} ({', '.join(f'"{col}"' for col in column_names)})
-                    VALUES %s
-                """
-                execute_values(cursor, insert_sql, batch)
-                total_imported += len(batch)
+                # Insert batch as one statement, so rowcount covers all of it
+                execute_values(cursor, insert_sql, batch, page_size=len(batch))
+                total_read += len(batch)
+                total_inserted += cursor.rowcount
                 batch = []
         
         # Insert remaining
         if batch:
-            placeholders = ','.join(['%s'] * len(column_names))
-            insert_sql = f"""
-                INSERT INTO {table_name} ({', '.join(f'"{col}"' for col in column_names)})
-                VALUES %s
-            """
-            execute_values(cursor, insert_sql, batch)
-            total_imported += len(batch)
+            execute_values(cursor, insert_sql, batch, page_size=len(batch))
+            total_read += len(batch)
+            total_inserted += cursor.rowcount
     
-    return total_imported
+    return total_read, total_inserted
+
+
+def copy_csv_data(cursor, table_name: str, csv_path: str, csv_info: Dict, buffer_size: int = 4 * 1024 * 1024) -> int:
+    """
+    Load CSV data with a single COPY ... FROM STDIN.
+    
+    The file is sent as raw bytes (no Python-side CSV parsing or decoding).
+    Raises psycopg2.DataError on rows COPY can't take (e.g. wrong number of
+    fields); import_csv_data handles those files instead.
+    
+    Returns:
+        Number of rows copied
+    """
+    column_names = [col.strip().replace(' ', '_').replace('-', '_') for col in csv_info['columns']]
+    column_list = ', '.join(f'"{col}"' for col in column_names)
+    # Empty TEXT fields stay '' (like the INSERT path); typed columns get NULL
+    text_columns = ', '.join(
+        f'"{name}"' for name, col in zip(column_names, csv_info['columns'])
+        if csv_info['column_types'].get(col, 'TEXT') == 'TEXT'
+    )
+    force_not_null = f", FORCE_NOT_NULL ({text_columns})" if text_columns else ""
+    
+    copy_sql = f"""
+        COPY {table_name} ({column_list})
+        FROM STDIN
+        WITH (FORMAT CSV, HEADER TRUE, DELIMITER E'{csv_info['delimiter'].encode('unicode_escape').decode()}',
+              ENCODING 'UTF8'{force_not_null})
+    """
+    # A UTF-8 BOM, if any, is part of the header line COPY skips
+    with open(csv_path, 'rb') as f:
+        cursor.copy_expert(copy_sql, f, size=buffer_size)
+    return cursor.rowcount
 
 
 def import_csv_to_postgres(csv_path: str, table_name: str, connection_params: Dict = None) -> Dict:
@@ -209,20 +241,31 @@ def import_csv_to_postgres(csv_path: str, table_name: str, connection_params: Di
         # Create table
         print(f"Creating table: {table_name}")
         create_table_from_csv(cursor, table_name, csv_info)
-        conn.commit()
         print(f"✓ Table created")
         print()
         
-        # Import data
+        # Import data: COPY first, batched INSERTs if COPY rejects the file.
+        # Table creation and load commit together
         print(f"Importing data from CSV...")
-        total_imported = import_csv_data(cursor, table_name, csv_path, csv_info)
+        cursor.execute("SAVEPOINT csv_copy;")
+        try:
+            # COPY loads every data row of the file or fails as a whole
+            total_imported = copy_csv_data(cursor, table_name, csv_path, csv_info)
+            count = total_imported
+            cursor.execute("RELEASE SAVEPOINT csv_copy;")
+        except psycopg2.DataError as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT csv_copy;")
+            print(f"⚠️  COPY failed ({str(e).strip().splitlines()[0]}), using batched INSERTs")
+            total_imported, count = import_csv_data(cursor, table_name, csv_path, csv_info)
         conn.commit()
         print(f"✓ Imported {total_imported:,} rows")
         print()
         
-        # Verify
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-        count = cursor.fetchone()[0]
+        # Verify: the table was created empty in the load's transaction, so
+        # the row counts the server reported for COPY/INSERT are its contents
+        # (no COUNT(*) scan needed)
+        if count != total_imported:
+            print(f"⚠️  Server reported {count:,} rows written, expected {total_imported:,}")
         
         return {
             'success': True,
@@ -6,6 +6,7 @@ This script only READS - makes NO changes
 import os
 import json
 import sqlite3
+from itertools import islice
 from pathlib import Path
 import shutil
 from datetime import datetime
@@ -43,38 +44,38 @@ try:
     print("INSPECTING ItemTable")
     print("=" * 70)
     
-    # Get all rows from ItemTable
+    # Stream rows from ItemTable in batches instead of loading the whole table
+    cursor.arraysize = 1000
     cursor.execute("SELECT * FROM ItemTable")
-    rows = cursor.fetchall()
+    columns = [description[0] for description in cursor.description]
     
-    print(f"\nTotal rows: {len(rows)}")
-    print(f"Columns: {[description[0] for description in cursor.description]}\n")
+    print(f"Columns: {columns}\n")
     
     # Look for chat-related entries
     chat_entries = []
     building_entries = []
-    all_entries = []
+    total_rows = 0
     
-    for row in rows:
-        row_dict = {}
-        for i, col in enumerate(cursor.description):
-            row_dict[col[0]] = row[i]
-        
-        all_entries.append(row_dict)
+    for row in cursor:
+        total_rows += 1
         
         # Convert values to string for searching
         row_str = str(row).lower()
         
         # Look for chat-related keywords
-        if any(keyword in row_str for keyword in ['chat', 'conversation', 'message', 'requestid']):
-            chat_entries.append(row_dict)
-        
+        is_chat = any(keyword in row_str for keyword in ['chat', 'conversation', 'message', 'requestid'])
         # Look for "building" keyword
-        if 'building' in row_str:
-            building_entries.append(row_dict)
+        is_building = 'building' in row_str
+        
+        if is_chat or is_building:
+            row_dict = dict(zip(columns, row))
+            if is_chat:
+                chat_entries.append(row_dict)
+            if is_building:
+                building_entries.append(row_dict)
     
     print(f"\n📊 Summary:")
-    print(f"  - Total entries: {len(all_entries)}")
+    print(f"  - Total entries: {total_rows}")
     print(f"  - Chat-related entries: {len(chat_entries)}")
     print(f"  - 'Building' keyword found: {len(building_entries)}")
     
@@ -130,9 +131,10 @@ try:
     print("\n" + "=" * 70)
     print("SAMPLE ENTRIES (First 5)")
     print("=" * 70)
-    for i, entry in enumerate(all_entries[:5], 1):
+    cursor.execute("SELECT * FROM ItemTable")
+    for i, row in enumerate(islice(cursor, 5), 1):
         print(f"\n--- Entry {i} ---")
-        for key, value in entry.items():
+        for key, value in zip(columns, row):
             if isinstance(value, str) and len(value) > 150:
                 display_value = value[:150] + "... (truncated)"
             else:
@@ -4,134 +4,304 @@ READ-ONLY DIAGNOSTIC: Find Cursor chat data
 This script only READS files - it makes NO changes
 """
 import os
+import re
+import sys
 import json
 import glob
-from pathlib import Path
-from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Everything reading/parsing a JSON file can raise (I/O, decode, syntax);
+# json/orjson decode errors are ValueError subclasses
+JSON_READ_ERRORS = (OSError, ValueError) + ((ijson.JSONError,) if ijson is not None else ())
+
+# Cursor storage locations, resolved once (plain str paths: no PurePath
+# allocation per join in the scan loops)
+APPDATA = os.getenv('APPDATA') or ''
+CURSOR_USER_DIR = os.path.join(APPDATA, "Cursor", "User")
+WORKSPACE_STORAGE = os.path.join(CURSOR_USER_DIR, "workspaceStorage")
+GLOBAL_STORAGE = os.path.join(CURSOR_USER_DIR, "globalStorage")
+LOCAL_STORAGE = os.path.join(APPDATA, "Cursor", "Local Storage")
+LEVELDB_PATH = os.path.join(LOCAL_STORAGE, "leveldb")
+
+# Substring identifying our project's workspace in workspace.json
+TARGET_WORKSPACE_MARKER = b"train_ai_tamar_request"
+
+# LevelDB file kinds, matched against the exact file name
+LEVELDB_FILE_PATTERN = re.compile(r"(?P<log>.*\.log)|(?P<manifest>MANIFEST.*)|(?P<sst>.*\.sst)")
+
+# Below this many entries a thread pool costs more than it saves
+BATCH_STAT_MIN_ENTRIES = 32
+BATCH_STAT_WORKERS = 32
+
+# One C-level scan per file name instead of several Python `in` tests
+FILE_KIND_PATTERN = re.compile(
+    r"(?P<chat>chat)|(?P<conversation>conversation)|(?P<building>building)"
+    r"|(?P<storage>storage|state)|(?P<json>\.json$)|(?P<db>\.(?:db|sqlite)$)"
+)
+
+def _walk(root, skip_dirs=()):
+    """
+    Yield a DirEntry for every file and directory under root (like rglob("*")).
+    
+    Uses one os.scandir pass per directory so callers can classify entries
+    from the cached name/type/stat data instead of re-walking with pathlib.
+    Directories whose path is in skip_dirs are yielded but not descended into.
+    """
+    skip_dirs = {os.fspath(d) for d in skip_dirs}
+    stack = [os.fspath(root)]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    yield entry
+                    if entry.is_dir(follow_symlinks=False) and entry.path not in skip_dirs:
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+def _file_kinds(name_lower):
+    """Return the set of FILE_KIND_PATTERN groups found in a lowercased name"""
+    return {m.lastgroup for m in FILE_KIND_PATTERN.finditer(name_lower)}
+
+def _load_json(path):
+    """Read and parse a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _top_level_keys(path, limit=None):
+    """
+    Return the top-level keys of a JSON object file (None if not an object).
+    
+    With ijson installed the file is streamed and reading stops after `limit`
+    keys, so large state files are never materialized as a dict.
+    """
+    if ijson is None:
+        data = _load_json(path)
+        if not isinstance(data, dict):
+            return None
+        return list(data.keys())[:limit]
+    
+    with open(path, 'rb') as f:
+        events = ijson.parse(f)
+        first = next(events, None)
+        if first is None or first[1] != 'start_map':
+            return None
+        keys = []
+        for prefix, event, value in events:
+            if prefix == '' and event == 'map_key':
+                keys.append(value)
+                if limit is not None and len(keys) >= limit:
+                    break
+        return keys
+
+@lru_cache(maxsize=None)
+def _scan_leveldb(path):
+    """
+    Scan a LevelDB directory once, collecting everything both the Local
+    Storage and LevelDB checks report (file kind counts, size, building hits).
+    """
+    result = {'log': 0, 'manifest': 0, 'sst': 0, 'total_size': 0, 'building_files': []}
+    with os.scandir(path) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            match = LEVELDB_FILE_PATTERN.fullmatch(entry.name)
+            if match:
+                result[match.lastgroup] += 1
+            result['total_size'] += entry.stat().st_size
+            if 'building' in entry.name.lower():
+                result['building_files'].append(entry.path)
+    return result
+
+def _stat_or_none(entry):
+    """DirEntry.stat() that returns None instead of raising (file vanished, no access)"""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+def _batch_stat(entries):
+    """
+    Stat many DirEntry objects, returning results in the same order.
+    
+    On Windows DirEntry.stat() is served from the directory listing (no
+    syscall). Elsewhere the scan is bound by stat() latency, so large
+    batches are issued from a thread pool while small ones run inline.
+    """
+    if os.name == 'nt' or len(entries) < BATCH_STAT_MIN_ENTRIES:
+        return [_stat_or_none(e) for e in entries]
+    with ThreadPoolExecutor(max_workers=BATCH_STAT_WORKERS) as executor:
+        return list(executor.map(_stat_or_none, entries))
+
+def _format_mtime(mtime):
+    """Format an st_mtime as local time (C-level strftime, no datetime object)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
 
 def find_cursor_chat_data():
     """Find Cursor chat storage locations"""
-    appdata = os.getenv('APPDATA')
     localappdata = os.getenv('LOCALAPPDATA')
     
     print("Searching for Cursor chat data...")
-    print(f"APPDATA: {appdata}")
+    print(f"APPDATA: {os.getenv('APPDATA')}")
     print(f"LOCALAPPDATA: {localappdata}\n")
     
     # Check workspaceStorage directories
-    workspace_storage = Path(appdata) / "Cursor" / "User" / "workspaceStorage"
+    workspace_storage = WORKSPACE_STORAGE
     
-    if not workspace_storage.exists():
+    if not os.path.exists(workspace_storage):
         print(f"Workspace storage not found at: {workspace_storage}")
         return
     
     print(f"Found workspace storage: {workspace_storage}\n")
     
     # Find all workspace directories
-    workspace_dirs = [d for d in workspace_storage.iterdir() if d.is_dir()]
+    with os.scandir(workspace_storage) as it:
+        workspace_dirs = [d for d in it if d.is_dir()]
     print(f"Found {len(workspace_dirs)} workspace directories\n")
     
     # Look for cursor-retri directories and chat data
     for ws_dir in workspace_dirs:
-        cursor_retri = ws_dir / "anysphere.cursor-retri"
+        cursor_retri = os.path.join(ws_dir.path, "anysphere.cursor-retri")
         
-        if cursor_retri.exists():
+        if os.path.exists(cursor_retri):
             print(f"\n=== Workspace: {ws_dir.name} ===")
             print(f"Cursor-retri directory: {cursor_retri}")
             
             # Check workspace.json to identify the workspace
-            ws_json = ws_dir / "workspace.json"
-            if ws_json.exists():
+            ws_json = os.path.join(ws_dir.path, "workspace.json")
+            if os.path.exists(ws_json):
                 try:
-                    with open(ws_json, 'r', encoding='utf-8') as f:
-                        ws_data = json.load(f)
-                        if 'folder' in ws_data:
-                            print(f"Workspace folder: {ws_data['folder']}")
-                        if 'folderUri' in ws_data:
-                            print(f"Workspace URI: {ws_data['folderUri']}")
-                except Exception as e:
+                    ws_data = _load_json(ws_json)
+                    if 'folder' in ws_data:
+                        print(f"Workspace folder: {ws_data['folder']}")
+                    if 'folderUri' in ws_data:
+                        print(f"Workspace URI: {ws_data['folderUri']}")
+                except JSON_READ_ERRORS as e:
                     print(f"Could not read workspace.json: {e}")
             
-            # List all files in cursor-retri
+            # List all files in cursor-retri (single walk, bucketed by name)
             try:
-                all_files = list(cursor_retri.rglob("*"))
+                all_files = []
+                json_files = []
+                chat_files = []
+                db_files = []
+                building_files = []
+                storage_files = []
+                for entry in _walk(cursor_retri):
+                    all_files.append(entry)
+                    kinds = _file_kinds(entry.name.lower())
+                    if not kinds:
+                        continue
+                    if 'chat' in kinds:
+                        chat_files.append(entry)
+                    if 'building' in kinds:
+                        building_files.append(entry)
+                    if 'json' in kinds:
+                        json_files.append(entry)
+                        if 'storage' in kinds:
+                            storage_files.append(entry)
+                    elif 'db' in kinds:
+                        db_files.append(entry)
+                
                 print(f"Files in cursor-retri: {len(all_files)}")
                 
                 # Look for JSON files that might contain chat data
-                json_files = list(cursor_retri.rglob("*.json"))
                 print(f"JSON files found: {len(json_files)}")
                 
                 # Look for files with "chat" in name
-                chat_files = [f for f in all_files if 'chat' in f.name.lower()]
                 if chat_files:
                     print(f"Chat-related files: {len(chat_files)}")
                     for cf in chat_files[:5]:  # Show first 5
-                        print(f"  - {cf.relative_to(cursor_retri)}")
+                        print(f"  - {os.path.relpath(cf.path, cursor_retri)}")
                 
                 # Look for database files
-                db_files = list(cursor_retri.rglob("*.db")) + list(cursor_retri.rglob("*.sqlite"))
                 if db_files:
                     print(f"Database files: {len(db_files)}")
-                    for db in db_files:
-                        print(f"  - {db.relative_to(cursor_retri)} ({db.stat().st_size} bytes)")
+                    db_stats = _batch_stat(db_files)
+                    for db, db_stat in zip(db_files, db_stats):
+                        size = db_stat.st_size if db_stat else 0
+                        print(f"  - {os.path.relpath(db.path, cursor_retri)} ({size} bytes)")
                 
                 # Look for files with "Building" in name (your chat name)
-                building_files = [f for f in all_files if 'building' in f.name.lower()]
                 if building_files:
                     print(f"\n*** FILES WITH 'BUILDING' IN NAME (YOUR CHAT?): {len(building_files)} ***")
-                    for bf in building_files:
-                        print(f"  - {bf.relative_to(cursor_retri)}")
-                        print(f"    Size: {bf.stat().st_size} bytes")
-                        print(f"    Modified: {bf.stat().st_mtime}")
+                    bf_stats = _batch_stat(building_files)
+                    for bf, bf_stat in zip(building_files, bf_stats):
+                        print(f"  - {os.path.relpath(bf.path, cursor_retri)}")
+                        if bf_stat:
+                            print(f"    Size: {bf_stat.st_size} bytes")
+                            print(f"    Modified: {bf_stat.st_mtime}")
                 
                 # Check for storage.json or similar
-                storage_files = [f for f in json_files if 'storage' in f.name.lower() or 'state' in f.name.lower()]
                 if storage_files:
                     print(f"\nStorage/State files: {len(storage_files)}")
                     for sf in storage_files:
-                        print(f"  - {sf.relative_to(cursor_retri)}")
+                        print(f"  - {os.path.relpath(sf.path, cursor_retri)}")
                         try:
-                            with open(sf, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                if isinstance(data, dict):
-                                    print(f"    Keys: {list(data.keys())[:10]}")
-                        except:
+                            keys = _top_level_keys(sf.path, limit=10)
+                            if keys is not None:
+                                print(f"    Keys: {keys}")
+                        except JSON_READ_ERRORS:
                             pass
             except Exception as e:
                 print(f"Error reading cursor-retri: {e}")
         
         # Also check the workspace directory itself for any files
-        all_ws_files = list(ws_dir.rglob("*"))
-        building_ws_files = [f for f in all_ws_files if 'building' in f.name.lower() and f.is_file()]
+        building_ws_files = [e for e in _walk(ws_dir.path) if 'building' in e.name.lower() and e.is_file()]
         if building_ws_files:
             print(f"\n*** FILES WITH 'BUILDING' IN WORKSPACE DIRECTORY: {len(building_ws_files)} ***")
-            for bf in building_ws_files:
-                print(f"  - {bf.relative_to(ws_dir)}")
-                print(f"    Size: {bf.stat().st_size} bytes")
+            bf_stats = _batch_stat(building_ws_files)
+            for bf, bf_stat in zip(building_ws_files, bf_stats):
+                print(f"  - {os.path.relpath(bf.path, ws_dir.path)}")
+                if bf_stat:
+                    print(f"    Size: {bf_stat.st_size} bytes")
 
 def check_global_storage():
     """Check global storage for chat data"""
-    appdata = os.getenv('APPDATA')
-    global_storage = Path(appdata) / "Cursor" / "User" / "globalStorage"
+    global_storage = GLOBAL_STORAGE
     
-    if not global_storage.exists():
+    if not os.path.exists(global_storage):
         print("\n\n=== Global Storage not found ===")
         return
     
     print("\n\n=== Checking Global Storage ===")
     
     # Look for cursor-specific storage
-    cursor_dirs = [d for d in global_storage.iterdir() if 'cursor' in d.name.lower()]
+    with os.scandir(global_storage) as it:
+        cursor_dirs = [d for d in it if 'cursor' in d.name.lower()]
     for cd in cursor_dirs:
         print(f"\nFound: {cd.name}")
-        json_files = list(cd.rglob("*.json"))
+        json_files = []
+        building_files = []
+        for entry in _walk(cd.path):
+            name_lower = entry.name.lower()
+            if name_lower.endswith('.json'):
+                json_files.append(entry)
+            if 'building' in name_lower:
+                building_files.append(entry)
+        
         if json_files:
             print(f"  JSON files: {len(json_files)}")
             for jf in json_files[:5]:
                 print(f"    - {jf.name}")
         
         # Look for building-related files
-        building_files = [f for f in cd.rglob("*") if 'building' in f.name.lower()]
         if building_files:
             print(f"  *** BUILDING FILES: {len(building_files)} ***")
             for bf in building_files:
@@ -139,21 +309,31 @@ def check_global_storage():
 
 def check_local_storage():
     """Check Local Storage and IndexedDB"""
-    appdata = os.getenv('APPDATA')
-    local_storage = Path(appdata) / "Cursor" / "Local Storage"
+    local_storage = LOCAL_STORAGE
     
     print("\n\n=== Checking Local Storage ===")
-    if local_storage.exists():
+    if os.path.exists(local_storage):
         print(f"Local Storage path: {local_storage}")
-        # Look for leveldb or other storage
-        leveldb_dirs = list(local_storage.rglob("*leveldb*"))
+        # Look for leveldb or other storage; the leveldb directory itself is
+        # scanned once by _scan_leveldb (shared with check_leveldb_for_chat)
+        leveldb_path = LEVELDB_PATH
+        leveldb_dirs = []
+        building_files = []
+        for entry in _walk(local_storage, skip_dirs=(leveldb_path,)):
+            name_lower = entry.name.lower()
+            if 'leveldb' in name_lower:
+                leveldb_dirs.append(entry.path)
+            if 'building' in name_lower and entry.is_file():
+                building_files.append(entry.path)
+        if os.path.isdir(leveldb_path):
+            building_files.extend(_scan_leveldb(leveldb_path)['building_files'])
+        
         if leveldb_dirs:
             print(f"LevelDB directories: {len(leveldb_dirs)}")
             for ld in leveldb_dirs:
                 print(f"  - {ld}")
         
         # Look for any files with building
-        building_files = [f for f in local_storage.rglob("*") if 'building' in f.name.lower() and f.is_file()]
         if building_files:
             print(f"*** BUILDING FILES IN LOCAL STORAGE: {len(building_files)} ***")
             for bf in building_files:
@@ -163,54 +343,63 @@ def check_local_storage():
 
 def check_leveldb_for_chat():
     """Check LevelDB storage for chat data"""
-    appdata = os.getenv('APPDATA')
-    leveldb_path = Path(appdata) / "Cursor" / "Local Storage" / "leveldb"
+    leveldb_path = LEVELDB_PATH
     
     print("\n\n=== Checking LevelDB Storage ===")
-    if leveldb_path.exists():
+    if os.path.exists(leveldb_path):
         print(f"LevelDB path: {leveldb_path}")
-        # LevelDB files
-        log_files = list(leveldb_path.glob("*.log"))
-        manifest_files = list(leveldb_path.glob("MANIFEST*"))
-        sst_files = list(leveldb_path.glob("*.sst"))
+        # LevelDB files (cached scan, usually already done by check_local_storage)
+        scan = _scan_leveldb(leveldb_path)
         
         print(f"LevelDB files found:")
-        print(f"  - Log files: {len(log_files)}")
-        print(f"  - Manifest files: {len(manifest_files)}")
-        print(f"  - SST files: {len(sst_files)}")
-        print(f"  - Total size: {sum(f.stat().st_size for f in leveldb_path.iterdir() if f.is_file()) / 1024 / 1024:.2f} MB")
+        print(f"  - Log files: {scan['log']}")
+        print(f"  - Manifest files: {scan['manifest']}")
+        print(f"  - SST files: {scan['sst']}")
+        print(f"  - Total size: {scan['total_size'] / 1024 / 1024:.2f} MB")
         print("\nNote: LevelDB requires special tools to read. We'll check other locations first.")
     else:
         print("LevelDB directory not found")
 
+def _mtime_or_zero(entry):
+    """Sort key: entry mtime, or 0 if it vanished or can't be read (sorted last)."""
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0
+
 def find_chat_by_name():
     """Specifically search for chat named 'Building a custom AI system poc'"""
-    appdata = os.getenv('APPDATA')
-    workspace_storage = Path(appdata) / "Cursor" / "User" / "workspaceStorage"
+    workspace_storage = WORKSPACE_STORAGE
     
     print("\n\n=== Searching for 'Building a custom AI system poc' Chat ===")
     
-    if not workspace_storage.exists():
+    if not os.path.exists(workspace_storage):
         print("Workspace storage not found")
         return None
     
     target_chat = None
-    workspace_dirs = [d for d in workspace_storage.iterdir() if d.is_dir()]
+    with os.scandir(workspace_storage) as it:
+        workspace_dirs = [d for d in it if d.is_dir()]
+    # Most recently modified first: the target workspace is almost always recent
+    workspace_dirs.sort(key=_mtime_or_zero, reverse=True)
     
     for ws_dir in workspace_dirs:
         # Check workspace.json to see if this is our workspace
-        ws_json = ws_dir / "workspace.json"
+        ws_json = os.path.join(ws_dir.path, "workspace.json")
         workspace_path = None
         
-        if ws_json.exists():
+        if os.path.exists(ws_json):
             try:
-                with open(ws_json, 'r', encoding='utf-8') as f:
-                    ws_data = json.load(f)
+                # Cheap byte scan first: only our workspace needs a JSON parse
+                with open(ws_json, 'rb') as f:
+                    blob = f.read()
+                if TARGET_WORKSPACE_MARKER in blob:
+                    ws_data = orjson.loads(blob) if orjson is not None else json.loads(blob)
                     if 'folder' in ws_data:
                         workspace_path = ws_data['folder']
                     elif 'folderUri' in ws_data:
                         workspace_path = ws_data['folderUri'].replace('file:///', '').replace('/', '\\')
-            except:
+            except JSON_READ_ERRORS:
                 pass
         
         # Check if this is our workspace
@@ -221,71 +410,87 @@ def find_chat_by_name():
             print(f"   Path: {workspace_path}")
         
         # Search for chat-related files
-        cursor_retri = ws_dir / "anysphere.cursor-retri"
-        if cursor_retri.exists():
+        cursor_retri = os.path.join(ws_dir.path, "anysphere.cursor-retri")
+        if os.path.exists(cursor_retri):
             try:
-                # Look for all files
-                all_files = list(cursor_retri.rglob("*"))
-                
-                # Search for files containing "building" or chat-related
-                building_files = [f for f in all_files if 'building' in f.name.lower()]
-                chat_files = [f for f in all_files if 'chat' in f.name.lower() or 'conversation' in f.name.lower()]
+                # Single walk: search for files containing "building", chat-related,
+                # database and storage/state files
+                building_files = []
+                chat_files = []
+                db_files = []
+                storage_files = []
+                for entry in _walk(cursor_retri):
+                    kinds = _file_kinds(entry.name.lower())
+                    if not kinds:
+                        continue
+                    if 'building' in kinds:
+                        building_files.append(entry)
+                    if 'chat' in kinds or 'conversation' in kinds:
+                        chat_files.append(entry)
+                    if 'db' in kinds:
+                        db_files.append(entry)
+                    elif 'json' in kinds and 'storage' in kinds:
+                        storage_files.append(entry)
                 
                 if building_files or (is_our_workspace and chat_files):
                     print(f"\n  Found in workspace: {ws_dir.name}")
                     if building_files:
                         print(f"  *** BUILDING-RELATED FILES: {len(building_files)} ***")
-                        for bf in building_files:
-                            size = bf.stat().st_size if bf.is_file() else 0
-                            mtime = datetime.fromtimestamp(bf.stat().st_mtime) if bf.is_file() else None
-                            print(f"    - {bf.relative_to(cursor_retri)}")
-                            if bf.is_file():
+                        bf_stats = _batch_stat(building_files)
+                        for bf, bf_stat in zip(building_files, bf_stats):
+                            is_file = bf.is_file() and bf_stat is not None
+                            size = bf_stat.st_size if is_file else 0
+                            mtime = _format_mtime(bf_stat.st_mtime) if is_file else None
+                            print(f"    - {os.path.relpath(bf.path, cursor_retri)}")
+                            if is_file:
                                 print(f"      Size: {size} bytes ({size/1024:.2f} KB)")
                                 print(f"      Modified: {mtime}")
                                 
                                 # Try to read JSON files
-                                if bf.suffix == '.json':
+                                if bf.name.endswith('.json'):
                                     try:
-                                        with open(bf, 'r', encoding='utf-8') as f:
-                                            data = json.load(f)
-                                            if isinstance(data, dict):
-                                                print(f"      Keys: {list(data.keys())[:10]}")
-                                                if 'title' in data or 'name' in data:
-                                                    print(f"      Title/Name: {data.get('title') or data.get('name')}")
-                                    except Exception as e:
+                                        data = _load_json(bf.path)
+                                        if isinstance(data, dict):
+                                            print(f"      Keys: {list(data.keys())[:10]}")
+                                            if 'title' in data or 'name' in data:
+                                                print(f"      Title/Name: {data.get('title') or data.get('name')}")
+                                    except JSON_READ_ERRORS as e:
                                         print(f"      (Could not read JSON: {e})")
                     
                     if is_our_workspace and chat_files:
                         print(f"  Chat-related files: {len(chat_files)}")
                         for cf in chat_files[:5]:
-                            print(f"    - {cf.relative_to(cursor_retri)}")
+                            print(f"    - {os.path.relpath(cf.path, cursor_retri)}")
                     
                     # Look for database files
-                    db_files = [f for f in all_files if f.suffix in ['.db', '.sqlite']]
                     if db_files:
                         print(f"  Database files: {len(db_files)}")
-                        for db in db_files:
-                            size = db.stat().st_size
-                            print(f"    - {db.relative_to(cursor_retri)} ({size/1024:.2f} KB)")
+                        db_stats = _batch_stat(db_files)
+                        for db, db_stat in zip(db_files, db_stats):
+                            size = db_stat.st_size if db_stat else 0
+                            print(f"    - {os.path.relpath(db.path, cursor_retri)} ({size/1024:.2f} KB)")
                 
                 # Check for storage.json or state.json
-                storage_files = [f for f in cursor_retri.rglob("*.json") 
-                               if 'storage' in f.name.lower() or 'state' in f.name.lower()]
                 if storage_files and is_our_workspace:
                     print(f"\n  Storage/State files: {len(storage_files)}")
                     for sf in storage_files:
-                        print(f"    - {sf.relative_to(cursor_retri)}")
+                        print(f"    - {os.path.relpath(sf.path, cursor_retri)}")
                         try:
-                            with open(sf, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                if isinstance(data, dict):
-                                    print(f"      Top-level keys: {list(data.keys())[:15]}")
-                                    # Look for chat-related keys
-                                    chat_keys = [k for k in data.keys() if 'chat' in k.lower() or 'conversation' in k.lower()]
-                                    if chat_keys:
-                                        print(f"      *** CHAT-RELATED KEYS: {chat_keys} ***")
-                        except Exception as e:
+                            # Chat keys may appear anywhere, so stream all top-level keys
+                            keys = _top_level_keys(sf.path)
+                            if keys is not None:
+                                print(f"      Top-level keys: {keys[:15]}")
+                                # Look for chat-related keys
+                                chat_keys = [k for k in keys if 'chat' in k.lower() or 'conversation' in k.lower()]
+                                if chat_keys:
+                                    print(f"      *** CHAT-RELATED KEYS: {chat_keys} ***")
+                        except JSON_READ_ERRORS as e:
                             print(f"      (Could not read: {e})")
+                
+                # Our workspace with its chat files located: no need to scan the rest
+                if is_our_workspace and building_files:
+                    target_chat = ws_dir.path
+                    break
                             
             except Exception as e:
                 print(f"  Error reading cursor-retri: {e}")
@@ -293,11 +498,15 @@ def find_chat_by_name():
     return target_chat
 
 if __name__ == "__main__":
-    print("=" * 70)
-    print("CURSOR CHAT DIAGNOSTIC - READ-ONLY SCAN")
-    print("=" * 70)
-    print("\nThis script only READS files - it makes NO changes to your system.")
-    print("Safe for Cursor Pro Teams - only examines YOUR local storage.\n")
+    # Progress shows up line by line even when piped to a file or pager
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stdout.write(
+        "=" * 70 + "\n"
+        "CURSOR CHAT DIAGNOSTIC - READ-ONLY SCAN\n"
+        + "=" * 70 + "\n"
+        "\nThis script only READS files - it makes NO changes to your system.\n"
+        "Safe for Cursor Pro Teams - only examines YOUR local storage.\n\n"
+    )
     
     find_cursor_chat_data()
     check_global_storage()
@@ -305,17 +514,18 @@ if __name__ == "__main__":
     check_leveldb_for_chat()
     target_chat = find_chat_by_name()
     
-    print("\n\n" + "=" * 70)
-    print("=== DIAGNOSTIC COMPLETE ===")
-    print("=" * 70)
-    print("\nSummary:")
-    print("- Scanned all Cursor workspace storage directories")
-    print("- Checked global storage and local storage")
-    print("- Searched specifically for 'Building a custom AI system poc'")
-    print("\nNext steps:")
-    print("1. Review the findings above")
-    print("2. If chat files found: We can attempt recovery (Option 2)")
-    print("3. If no files found: Chat may be lost or in cloud storage")
-    print("4. If corrupted files found: We can try to repair them")
-    print("\n" + "=" * 70)
-
+    sys.stdout.write(
+        "\n\n" + "=" * 70 + "\n"
+        "=== DIAGNOSTIC COMPLETE ===\n"
+        + "=" * 70 + "\n"
+        "\nSummary:\n"
+        "- Scanned all Cursor workspace storage directories\n"
+        "- Checked global storage and local storage\n"
+        "- Searched specifically for 'Building a custom AI system poc'\n"
+        "\nNext steps:\n"
+        "1. Review the findings above\n"
+        "2. If chat files found: We can attempt recovery (Option 2)\n"
+        "3. If no files found: Chat may be lost or in cloud storage\n"
+        "4. If corrupted files found: We can try to repair them\n"
+        "\n" + "=" * 70 + "\n"
+    )
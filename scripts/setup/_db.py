@@ -0,0 +1,96 @@
+"""
+Shared PostgreSQL connection and helpers for the setup scripts.
+
+When several setup steps run in one process they reuse a single connection
+instead of paying the connect/auth handshake in every script.
+
+Set POSTGRES_DSN to override the individual POSTGRES_* variables.
+"""
+import os
+import tempfile
+from functools import lru_cache
+from types import SimpleNamespace
+
+import psycopg2
+from dotenv import load_dotenv
+
+APPLICATION_NAME = "ai_rag_setup"
+
+_conn = None
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> SimpleNamespace:
+    """
+    Read database settings from .env once per process.
+
+    database and password are None when unset so callers can detect a
+    missing configuration.
+    """
+    load_dotenv()
+    return SimpleNamespace(
+        dsn=os.getenv('POSTGRES_DSN'),
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=int(os.getenv('POSTGRES_PORT', '5433')),
+        database=os.getenv('POSTGRES_DATABASE'),
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD'),
+    )
+
+
+def get_connection_params() -> dict:
+    """Get connection parameters (same defaults as the setup scripts)."""
+    settings = get_settings()
+    return {
+        'host': settings.host,
+        'port': settings.port,
+        'database': settings.database or 'ai_requests_db',
+        'user': settings.user,
+        'password': settings.password or 'password',
+    }
+
+
+def get_conn():
+    """
+    Get the shared connection, opening (or re-opening) it if needed.
+
+    Callers may close it when done; the next call simply reconnects.
+    """
+    global _conn
+    if _conn is None or _conn.closed:
+        dsn = get_settings().dsn
+        if dsn:
+            _conn = psycopg2.connect(dsn, application_name=APPLICATION_NAME)
+        else:
+            _conn = psycopg2.connect(application_name=APPLICATION_NAME, **get_connection_params())
+    return _conn
+
+
+def ask(answers, key: str, prompt: str, default: str = "") -> str:
+    """
+    Prompt for a value, or take it from the answers file when one is given.
+
+    Empty input (or a missing key) gives the default.
+    """
+    if answers is None:
+        return input(prompt).strip() or default
+    value = answers.get(key)
+    return default if value is None else str(value).strip()
+
+
+def atomic_write(path, data: str):
+    """
+    Write a text file atomically: a temp file in the same directory is
+    fsynced and then renamed over the target, so a crash never leaves a
+    half-written file. (The temp file, and so the result, is owner-only.)
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -7,34 +7,37 @@ Detects:
 - Primary key suggestions
 - Text field suggestions
 """
+import hashlib
+import json
 import psycopg2
+import re
+import sys
+from itertools import groupby
+from pathlib import Path
 from typing import Dict, List, Optional
-import os
-from dotenv import load_dotenv
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.setup._db import get_conn, get_settings
+
+# Column-name tests for suggest_text_fields, one regex search each
+EXCLUDE_FIELD_PATTERN = re.compile(r"_id|_uuid|_guid|created_at|updated_at|deleted_at")
+TEXT_FIELD_NAME_PATTERN = re.compile(r"name|desc|description|title|content|text|remark|note|comment|message")
+
+# Where cached_table_schemas keeps detected schemas between runs
+SCHEMA_CACHE_DIR = Path.home() / ".cache" / "ai_rag"
 
 def get_database_connection():
-    """Get database connection from .env or return None."""
-    load_dotenv()
-    
-    host = os.getenv("POSTGRES_HOST", "localhost")
-    port = int(os.getenv("POSTGRES_PORT", "5433"))
-    database = os.getenv("POSTGRES_DATABASE")
-    user = os.getenv("POSTGRES_USER", "postgres")
-    password = os.getenv("POSTGRES_PASSWORD")
+    """Get the shared setup database connection from .env or return None."""
+    settings = get_settings()
     
-    if not database or not password:
+    if not settings.dsn and (not settings.database or not settings.password):
         return None
     
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            database=database,
-            user=user,
-            password=password
-        )
-        return conn
+        return get_conn()
     except Exception as e:
         print(f"Error connecting to database: {e}")
         return None
@@ -79,37 +82,146 @@ def detect_table_schema(cursor, table_name: str) -> Dict:
         ORDER BY ordinal_position;
     """, (table_name,))
     
-    columns = []
-    for row in cursor.fetchall():
-        columns.append({
-            'name': row[0],
-            'type': row[1],
-            'nullable': row[2] == 'YES',
-            'default': row[3]
-        })
-    
-    # Detect primary key
-    primary_key = suggest_primary_key(columns, table_name)
+    columns = [column_from_row(row) for row in cursor.fetchall()]
     
-    # Detect text fields
-    text_fields = suggest_text_fields(columns)
-    
-    # Get row count
+    # Get row count: planner estimate (no scan), exact count only if the
+    # table was never analyzed (reltuples = -1)
     try:
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;", (table_name,))
         row_count = cursor.fetchone()[0]
-    except:
+        if row_count < 0:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
+            row_count = cursor.fetchone()[0]
+    except psycopg2.Error:
+        # Clear the aborted transaction so the connection stays usable
+        cursor.connection.rollback()
         row_count = 0
     
+    return build_table_schema(table_name, columns, row_count)
+
+
+def column_from_row(row) -> Dict:
+    """Convert a (column_name, data_type, is_nullable, column_default) row to a column dict."""
+    return {
+        'name': row[0],
+        'type': row[1],
+        'nullable': row[2] == 'YES',
+        'default': row[3]
+    }
+
+
+def build_table_schema(table_name: str, columns: List[Dict], row_count: int,
+                       primary_key: Optional[str] = None) -> Dict:
+    """
+    Assemble the schema dict for a table, adding primary key and text field suggestions.
+    
+    A declared (single-column) primary key is used as is; otherwise one is
+    suggested from the column names.
+    """
     return {
         'table_name': table_name,
         'columns': columns,
-        'primary_key': primary_key,
-        'text_fields': text_fields,
+        'primary_key': primary_key or suggest_primary_key(columns, table_name),
+        'text_fields': suggest_text_fields(columns),
         'row_count': row_count
     }
 
 
+def detect_all_table_schemas(cursor) -> Dict[str, Dict]:
+    """
+    Detect schemas for all tables in two round-trips, regardless of table count.
+    
+    Row counts are planner estimates from pg_class.reltuples (no COUNT(*) scans);
+    tables that were never analyzed report 0. Declared single-column primary
+    keys come back with the same catalog query.
+    
+    Returns:
+        Dict of table name -> schema dict (ordered by table name)
+    """
+    cursor.execute("""
+        SELECT c.relname, GREATEST(c.reltuples, 0)::bigint, a.attname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_index i ON i.indrelid = c.oid AND i.indisprimary AND i.indnatts = 1
+        LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = i.indkey[0]
+        WHERE n.nspname = 'public'
+        AND c.relkind IN ('r', 'p')
+        ORDER BY c.relname;
+    """)
+    row_counts = {}
+    primary_keys = {}
+    for table_name, row_count, primary_key in cursor.fetchall():
+        row_counts[table_name] = row_count
+        primary_keys[table_name] = primary_key
+    
+    cursor.execute("""
+        SELECT 
+            table_name,
+            column_name,
+            data_type,
+            is_nullable,
+            column_default
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        ORDER BY table_name, ordinal_position;
+    """)
+    
+    columns_by_table = {}
+    for table_name, rows in groupby(cursor.fetchall(), key=lambda row: row[0]):
+        if table_name in row_counts:  # skip views
+            columns_by_table[table_name] = [column_from_row(row[1:]) for row in rows]
+    
+    return {
+        table_name: build_table_schema(
+            table_name, columns_by_table.get(table_name, []), row_count, primary_keys[table_name]
+        )
+        for table_name, row_count in row_counts.items()
+    }
+
+
+def cached_table_schemas(cursor, use_cache: bool = True) -> Dict[str, Dict]:
+    """
+    detect_all_table_schemas, cached on disk per database.
+    
+    The cache file is keyed by host/port/database/user and is only used
+    while a cheap catalog fingerprint matches: table DDL rewrites pg_class
+    rows (new xmin), column renames and NOT NULL changes rewrite
+    pg_attribute rows, default changes touch pg_attrdef, and ANALYZE
+    changes reltuples, so any of these forces a fresh detection.
+    """
+    if not use_cache:
+        return detect_all_table_schemas(cursor)
+    
+    params = cursor.connection.get_dsn_parameters()
+    key = f"{params.get('host')}:{params.get('port')}:{params.get('dbname')}:{params.get('user')}"
+    cache_file = SCHEMA_CACHE_DIR / f"schema-{hashlib.sha256(key.encode()).hexdigest()[:16]}.json"
+    
+    cursor.execute("""
+        SELECT count(*), max(xmin::text::bigint), sum(reltuples)::bigint,
+               (SELECT max(xmin::text::bigint) FROM pg_attribute),
+               (SELECT count(*) || '/' || coalesce(max(xmin::text::bigint), 0) FROM pg_attrdef)
+        FROM pg_class;
+    """)
+    version = ':'.join(str(v) for v in cursor.fetchone())
+    
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == version:
+            return cached['schemas']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    schemas = detect_all_table_schemas(cursor)
+    try:
+        SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'schemas': schemas}, f, separators=(',', ':'))
+    except OSError:
+        pass  # caching is best-effort
+    return schemas
+
+
 def suggest_primary_key(columns: List[Dict], table_name: str) -> Optional[str]:
     """
     Suggest primary key column.
@@ -125,33 +237,25 @@ def suggest_primary_key(columns: List[Dict], table_name: str) -> Optional[str]:
     # Check for explicit primary key constraint
     # (This would require checking constraints, but for now we use patterns)
     
-    # Pattern 1: {table}_id
-    pattern1 = f"{table_name_lower}_id"
+    # Lowercased name -> column name, built once (first occurrence wins)
+    names_lower = {}
     for col in columns:
-        if col['name'].lower() == pattern1:
-            return col['name']
+        names_lower.setdefault(col['name'].lower(), col['name'])
     
-    # Pattern 2: id
-    for col in columns:
-        if col['name'].lower() == 'id':
-            return col['name']
+    # Patterns 1-3: {table}_id, id, {table}id
+    for pattern in (f"{table_name_lower}_id", 'id', f"{table_name_lower}id"):
+        if pattern in names_lower:
+            return names_lower[pattern]
     
-    # Pattern 3: {table}id
-    pattern3 = f"{table_name_lower}id"
-    for col in columns:
-        if col['name'].lower() == pattern3:
-            return col['name']
-    
-    # Pattern 4: ends with _id
-    for col in columns:
-        if col['name'].lower().endswith('_id'):
-            return col['name']
-    
-    # Pattern 5: ends with id (but not _id)
-    for col in columns:
-        name_lower = col['name'].lower()
-        if name_lower.endswith('id') and not name_lower.endswith('_id'):
-            return col['name']
+    # Pattern 4: ends with _id, then pattern 5: ends with id (but not _id)
+    id_suffix_match = None
+    for name_lower, name in names_lower.items():
+        if name_lower.endswith('_id'):
+            return name
+        if id_suffix_match is None and name_lower.endswith('id'):
+            id_suffix_match = name
+    if id_suffix_match is not None:
+        return id_suffix_match
     
     # Fallback: first column
     if columns:
@@ -172,14 +276,13 @@ def suggest_text_fields(columns: List[Dict]) -> List[str]:
     - System fields (created_at, updated_at)
     """
     text_fields = []
-    exclude_patterns = ['_id', '_uuid', '_guid', 'created_at', 'updated_at', 'deleted_at']
     
     for col in columns:
         name_lower = col['name'].lower()
         type_lower = col['type'].lower()
         
         # Skip if matches exclude pattern
-        if any(pattern in name_lower for pattern in exclude_patterns):
+        if EXCLUDE_FIELD_PATTERN.search(name_lower):
             continue
         
         # Skip if ends with 'id' (likely foreign key)
@@ -190,7 +293,7 @@ def suggest_text_fields(columns: List[Dict]) -> List[str]:
         if 'text' in type_lower or 'varchar' in type_lower or 'char' in type_lower:
             text_fields.append(col['name'])
         # Include if name suggests text content
-        elif any(word in name_lower for word in ['name', 'desc', 'description', 'title', 'content', 'text', 'remark', 'note', 'comment', 'message']):
+        elif TEXT_FIELD_NAME_PATTERN.search(name_lower):
             text_fields.append(col['name'])
     
     return text_fields
@@ -207,6 +310,8 @@ def detect_schema(connection_params: Dict = None) -> Dict:
     Returns:
         Dict with tables and their schemas
     """
+    # Only close connections opened here; the shared one stays open for reuse
+    owns_conn = bool(connection_params)
     if connection_params:
         conn = psycopg2.connect(**connection_params)
     else:
@@ -218,25 +323,21 @@ def detect_schema(connection_params: Dict = None) -> Dict:
     cursor = conn.cursor()
     
     try:
-        # Detect all tables
-        tables = detect_all_tables(cursor)
+        # Detect all tables and their schemas in one batch
+        schemas = detect_all_table_schemas(cursor)
         
-        if not tables:
+        if not schemas:
             return {'error': 'No tables found in database'}
         
-        # Detect schema for each table
-        schemas = {}
-        for table in tables:
-            schemas[table] = detect_table_schema(cursor, table)
-        
         return {
-            'tables': tables,
+            'tables': list(schemas),
             'schemas': schemas
         }
     
     finally:
         cursor.close()
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
 if __name__ == "__main__":
@@ -257,7 +358,7 @@ if __name__ == "__main__":
         for table_name in result['tables'][:10]:  # Show first 10
             schema = result['schemas'][table_name]
             print(f"Table: {table_name}")
-            print(f"  Rows: {schema['row_count']:,}")
+            print(f"  Rows: ~{schema['row_count']:,}")
             print(f"  Columns: {len(schema['columns'])}")
             print(f"  Primary Key (suggested): {schema['primary_key']}")
             print(f"  Text Fields (suggested): {len(schema['text_fields'])} fields")
@@ -1,30 +1,44 @@
 """
 Check what tables exist in Docker PostgreSQL.
 """
-import os
 import sys
-import psycopg2
-from dotenv import load_dotenv
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.setup._db import get_conn
+
+
+def format_bytes(num_bytes: int) -> str:
+    """Format a byte count as a human-readable size."""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
 
-load_dotenv()
 
 try:
-    conn = psycopg2.connect(
-        host=os.getenv('POSTGRES_HOST', 'localhost'),
-        port=int(os.getenv('POSTGRES_PORT', 5433)),
-        database=os.getenv('POSTGRES_DATABASE', 'ai_requests_db'),
-        user=os.getenv('POSTGRES_USER', 'postgres'),
-        password=os.getenv('POSTGRES_PASSWORD', 'password'),
-    )
+    conn = get_conn()
     
     cursor = conn.cursor()
     
-    # List all tables
+    # List all tables with estimated row counts and total size in one catalog
+    # query (pg_class.reltuples instead of a COUNT(*) scan per table),
+    # largest tables first
     cursor.execute("""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public'
-        ORDER BY table_name;
+        SELECT
+            c.relname,
+            GREATEST(c.reltuples, 0)::bigint AS rows,
+            pg_total_relation_size(c.oid) AS bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+        AND c.relkind = 'r'
+        ORDER BY bytes DESC, c.relname;
     """)
     
     tables = cursor.fetchall()
@@ -36,17 +50,12 @@ try:
     
     if tables:
         print(f"Found {len(tables)} table(s):")
-        for table in tables:
-            table_name = table[0]
-            # Get row count
-            cursor.execute(f'SELECT COUNT(*) FROM "{table_name}";')
-            count = cursor.fetchone()[0]
-            print(f"  - {table_name}: {count} rows")
+        for table_name, count, size in tables:
+            print(f"  - {table_name}: ~{count} rows, {format_bytes(size)}")
     else:
         print("No tables found!")
     
     cursor.close()
-    conn.close()
     
 except Exception as e:
     print(f"Error: {e}")
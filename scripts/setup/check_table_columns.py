@@ -1,20 +1,17 @@
 """
 Check what columns exist in the requests table.
 """
-import os
-import psycopg2
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 
-load_dotenv()
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.setup._db import get_conn
 
 try:
-    conn = psycopg2.connect(
-        host=os.getenv('POSTGRES_HOST', 'localhost'),
-        port=int(os.getenv('POSTGRES_PORT', 5433)),
-        database=os.getenv('POSTGRES_DATABASE', 'ai_requests_db'),
-        user=os.getenv('POSTGRES_USER', 'postgres'),
-        password=os.getenv('POSTGRES_PASSWORD', 'password'),
-    )
+    conn = get_conn()
     
     cursor = conn.cursor()
     
@@ -55,7 +52,6 @@ try:
         print("No columns found! Table might be empty or not exist.")
     
     cursor.close()
-    conn.close()
     
 except Exception as e:
     print(f"Error: {e}")
@@ -1,20 +1,24 @@
 """
 Create request_embeddings table for Docker PostgreSQL.
+
+For bulk loads (>100k rows), insert with psycopg2.extras.execute_values or
+COPY, and rebuild the vector index afterwards instead of updating it per row:
+    DROP INDEX idx_request_embeddings_vector;
+    -- bulk insert / COPY ...
+    CREATE INDEX idx_request_embeddings_vector ON request_embeddings
+        USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 """
-import os
-import psycopg2
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
 
-load_dotenv()
+from scripts.setup._db import get_conn
 
 try:
-    conn = psycopg2.connect(
-        host=os.getenv('POSTGRES_HOST', 'localhost'),
-        port=int(os.getenv('POSTGRES_PORT', 5433)),
-        database=os.getenv('POSTGRES_DATABASE', 'ai_requests_db'),
-        user=os.getenv('POSTGRES_USER', 'postgres'),
-        password=os.getenv('POSTGRES_PASSWORD', 'password'),
-    )
+    conn = get_conn()
     
     # Register pgvector
     from pgvector.psycopg2 import register_vector
@@ -24,7 +28,8 @@ try:
     
     print("Creating request_embeddings table...")
     
-    # Create table
+    # Create table and indexes in one round-trip (psycopg2 accepts
+    # multi-statement strings; they run in the same transaction)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS request_embeddings (
             id SERIAL PRIMARY KEY,
@@ -36,30 +41,34 @@ try:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             UNIQUE(requestid, chunk_index)
         );
-    """)
-    
-    # Create vector index
-    cursor.execute("""
+        
+        -- Vector index: HNSW needs no training data, so it is valid on the
+        -- empty table (ivfflat centroids built here would be meaningless).
+        -- Tune recall at query time with: SET hnsw.ef_search = 40;
         CREATE INDEX IF NOT EXISTS idx_request_embeddings_vector 
         ON request_embeddings 
-        USING ivfflat (embedding vector_cosine_ops)
-        WITH (lists = 100);
-    """)
-    
-    # Create index on requestid
-    cursor.execute("""
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+        
+        -- Index on requestid
         CREATE INDEX IF NOT EXISTS idx_request_embeddings_requestid 
         ON request_embeddings(requestid);
+        
+        -- BRIN on created_at: rows are append-only, so a block-range index
+        -- is tiny compared to a btree and still prunes time-range scans
+        CREATE INDEX IF NOT EXISTS idx_request_embeddings_created_at 
+        ON request_embeddings 
+        USING brin (created_at)
+        WITH (pages_per_range = 32);
     """)
     
     conn.commit()
     cursor.close()
-    conn.close()
     
     print("✅ request_embeddings table created successfully!")
     print("   - Table: request_embeddings")
     print("   - Vector dimension: 384")
-    print("   - Indexes created")
+    print("   - Indexes created (HNSW vector index, requires pgvector >= 0.5.0)")
     
 except Exception as e:
     print(f"❌ Error: {e}")
@@ -8,6 +8,8 @@ import sys
 from pathlib import Path
 import subprocess
 
+MODEL_REPO_ID = "mistralai/Mistral-7B-Instruct-v0.2"
+
 def get_model_path():
     """Get the default model path."""
     current_path = Path(__file__).resolve()
@@ -23,15 +25,14 @@ def check_model_exists(model_path):
     if not model_path.exists():
         return False
     
-    # Check for model files
-    model_files = list(model_path.glob("*.safetensors")) + list(model_path.glob("*.bin"))
-    config_file = model_path / "config.json"
-    tokenizer_file = model_path / "tokenizer.json"
+    # One directory read; file names are enough to decide
+    with os.scandir(model_path) as it:
+        names = {entry.name for entry in it if entry.is_file()}
     
     # Need at least config, tokenizer, and some model files
-    has_config = config_file.exists()
-    has_tokenizer = tokenizer_file.exists()
-    has_model_files = len(model_files) > 0
+    has_config = 'config.json' in names
+    has_tokenizer = 'tokenizer.json' in names
+    has_model_files = any(name.endswith(('.safetensors', '.bin')) for name in names)
     
     return has_config and has_tokenizer and has_model_files
 
@@ -41,7 +42,7 @@ def download_model(model_path):
     print("DOWNLOADING LLM MODEL")
     print("=" * 80)
     print()
-    print(f"Model: mistralai/Mistral-7B-Instruct-v0.2")
+    print(f"Model: {MODEL_REPO_ID}")
     print(f"Destination: {model_path}")
     print()
     print("⚠️  This will download ~4-7GB (depending on format)")
@@ -52,32 +53,29 @@ def download_model(model_path):
     model_path.mkdir(parents=True, exist_ok=True)
     
     try:
-        from transformers import AutoModelForCausalLM, AutoTokenizer
+        # Use the Rust parallel transfer backend when it is installed
+        # (must be set before huggingface_hub is imported)
+        import importlib.util
+        if importlib.util.find_spec("hf_transfer") is not None:
+            os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+        
+        from huggingface_hub import snapshot_download
         
         print("📥 Starting download...")
         print("   This may take a while, please be patient...")
         print()
         
-        # Download model and tokenizer
-        # Use local_files_only=False to allow download
-        model = AutoModelForCausalLM.from_pretrained(
-            "mistralai/Mistral-7B-Instruct-v0.2",
-            cache_dir=str(model_path.parent),
-            local_files_only=False  # Allow download
-        )
-        
-        tokenizer = AutoTokenizer.from_pretrained(
-            "mistralai/Mistral-7B-Instruct-v0.2",
-            cache_dir=str(model_path.parent),
-            local_files_only=False  # Allow download
+        # Download the repository files straight to our location (no loading
+        # of the weights into memory and re-saving). The repo ships the same
+        # weights as both .safetensors and .bin; only the safetensors are needed.
+        snapshot_download(
+            repo_id=MODEL_REPO_ID,
+            local_dir=str(model_path),
+            local_dir_use_symlinks=False,
+            ignore_patterns=["*.bin", "*.pth"],
+            max_workers=8
         )
         
-        # Save to our location
-        print()
-        print("💾 Saving model to project directory...")
-        model.save_pretrained(str(model_path))
-        tokenizer.save_pretrained(str(model_path))
-        
         print()
         print("✅ Model downloaded and saved successfully!")
         print(f"   Location: {model_path}")
@@ -85,8 +83,8 @@ def download_model(model_path):
         return True
         
     except ImportError:
-        print("❌ Error: transformers library not installed")
-        print("   Install with: pip install transformers")
+        print("❌ Error: huggingface_hub library not installed")
+        print("   Install with: pip install huggingface_hub")
         return False
     except Exception as e:
         print(f"❌ Error downloading model: {e}")
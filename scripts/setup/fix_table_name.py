@@ -18,12 +18,13 @@ try:
     
     cursor = conn.cursor()
     
-    # List all tables
+    # List all tables with approximate row counts from the statistics
+    # collector (one catalog lookup instead of a COUNT(*) scan per table)
     cursor.execute("""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public'
-        ORDER BY table_name;
+        SELECT relname, n_live_tup 
+        FROM pg_stat_user_tables 
+        WHERE schemaname = 'public'
+        ORDER BY relname;
     """)
     
     tables = cursor.fetchall()
@@ -35,11 +36,8 @@ try:
     
     if tables:
         print(f"Found {len(tables)} table(s):")
-        for table in tables:
-            table_name = table[0]
-            cursor.execute(f'SELECT COUNT(*) FROM "{table_name}";')
-            count = cursor.fetchone()[0]
-            print(f"  - {table_name}: {count} rows")
+        for table_name, count in tables:
+            print(f"  - {table_name}: ~{count} rows")
         
         print()
         # Check if requests table exists
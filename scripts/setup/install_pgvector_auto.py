@@ -9,18 +9,91 @@ This script will:
 5. Enable the extension in your database
 """
 import os
+import re
 import sys
+import hashlib
+import json
 import subprocess
-import psycopg2
+import tempfile
+import threading
 import zipfile
 import shutil
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
 from getpass import getpass
 import time
 
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+try:
+    import win32service
+    import win32serviceutil
+except ImportError:
+    win32service = None
+
+# Downloads smaller than this are not worth splitting into ranges
+PARALLEL_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL_BYTES = 64 * 1024 * 1024
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+# pgvector zips are well under this; larger downloads spill to disk
+IN_MEMORY_ZIP_MAX_SIZE = 64 * 1024 * 1024
+
+def _find_postgresql_in_registry():
+    """Newest installation recorded by the EDB installer under HKLM, or (None, None)."""
+    if winreg is None:
+        return None, None
+    
+    installs = []
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\PostgreSQL\Installations") as key:
+            for i in range(winreg.QueryInfoKey(key)[0]):
+                with winreg.OpenKey(key, winreg.EnumKey(key, i)) as install:
+                    base_dir = winreg.QueryValueEx(install, "Base Directory")[0]
+                    version = winreg.QueryValueEx(install, "Version")[0]
+                major = version.split('.')[0]
+                if major.isdigit():
+                    installs.append((int(major), major, Path(base_dir)))
+    except OSError:
+        return None, None
+    
+    for _, version, path in sorted(installs, reverse=True):
+        if (path / "lib").exists():
+            return version, path
+    return None, None
+
+def _find_postgresql_with_pg_config():
+    """Installation owning the pg_config on PATH (Chocolatey, MSYS2, ...), or (None, None)."""
+    pg_config = shutil.which("pg_config")
+    if not pg_config:
+        return None, None
+    try:
+        # e.g. "PostgreSQL 16.1" and "C:\Program Files\PostgreSQL\16\bin"
+        version_line = subprocess.check_output([pg_config, "--version"], text=True, timeout=10)
+        bindir = subprocess.check_output([pg_config, "--bindir"], text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None, None
+    
+    match = re.search(r"PostgreSQL (\d+)", version_line)
+    path = Path(bindir.strip()).parent
+    if match and (path / "lib").exists():
+        return match.group(1), path
+    return None, None
+
+@lru_cache(maxsize=1)
 def find_postgresql_path():
-    """Find PostgreSQL installation path and version."""
+    """Find PostgreSQL installation path and version (cached per run)."""
+    # Registry and pg_config know about custom install directories
+    for finder in (_find_postgresql_in_registry, _find_postgresql_with_pg_config):
+        version, path = finder()
+        if path:
+            return version, path
+    
     common_paths = [
         ("16", Path("C:/Program Files/PostgreSQL/16")),
         ("15", Path("C:/Program Files/PostgreSQL/15")),
@@ -38,6 +111,27 @@ def find_postgresql_path():
     
     return None, None
 
+GITHUB_RELEASE_API = "https://api.github.com/repos/pgvector/pgvector/releases/tags/{tag}"
+
+def get_published_sha256(tag, filename, timeout=15):
+    """
+    SHA-256 of a release asset as published by GitHub, or None.
+    
+    GitHub reports each release asset's digest as "sha256:<hex>" in the
+    release metadata (older releases may not have one).
+    """
+    try:
+        response = get_session().get(GITHUB_RELEASE_API.format(tag=tag), timeout=timeout)
+        response.raise_for_status()
+        assets = response.json().get('assets', [])
+    except Exception:
+        return None
+    for asset in assets:
+        digest = asset.get('digest') or ''
+        if asset.get('name') == filename and digest.startswith('sha256:'):
+            return digest.split(':', 1)[1]
+    return None
+
 def get_pgvector_download_url(version):
     """Get pgvector download URL for specific PostgreSQL version."""
     # Try latest release
@@ -55,67 +149,299 @@ def get_pgvector_download_url(version):
     filename = f"pgvector-{pgvector_version}-pg{version}-windows-x64.zip"
     url = f"{base_url}/{pgvector_version}/{filename}"
     
-    return url, filename
+    return url, filename, pgvector_version
+
+@lru_cache(maxsize=1)
+def get_session():
+    """
+    Shared HTTP session: parallel range workers and retries reuse pooled
+    keep-alive connections instead of a new TCP+TLS handshake per request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[429, 502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def _get_with_retry(url, retries, timeout, headers=None):
+    """
+    GET with exponential backoff (1s, 2s, 4s, ...) on network/HTTP errors.
+    
+    The session already retries connection errors and 429/5xx responses;
+    this outer loop backs off further once those retries are exhausted.
+    """
+    import requests
+    
+    for attempt in range(retries + 1):
+        try:
+            response = get_session().get(url, stream=True, timeout=timeout, headers=headers)
+            response.raise_for_status()
+            return response
+        except requests.RequestException:
+            if attempt == retries:
+                raise
+            time.sleep(2 ** attempt)
+
+def _drop_page_cache(f, offset=0, length=0):
+    """
+    Tell the kernel the written range won't be re-read soon (POSIX only).
+    
+    Downloads are read once (to extract) or by another process much later,
+    so they shouldn't evict the database's working set from the page cache.
+    Pages still dirty are skipped by the kernel, so this is best effort.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+def _download_range(url, dest_path, start, end, retries, timeout):
+    """Download bytes [start, end] of url into the same offset of dest_path."""
+    response = _get_with_retry(url, retries, timeout, headers={"Range": f"bytes={start}-{end}"})
+    if response.status_code != 206:
+        raise IOError(f"Server ignored range request (HTTP {response.status_code})")
+    with open(dest_path, 'r+b') as f:
+        f.seek(start)
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+        f.flush()
+        _drop_page_cache(f, start, end - start + 1)
+
+def _signed_url_expired(error):
+    """True if a range request failed because its signed redirect URL expired."""
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in (401, 403, 410)
+
+def _download_ranges(url, dest_path, total_size, parts, retries, timeout, fetch_url=None):
+    """
+    Download a file as `parts` parallel byte ranges into a pre-sized file.
+    
+    Finished ranges are recorded in <dest>.part.json under `url`, so
+    re-running after a failure only fetches the ranges that are still
+    missing. The ranges themselves come from fetch_url (the redirect target,
+    e.g. a signed GitHub asset URL that changes every run); if it expires
+    mid-download, `url` is probed again for a fresh one.
+    """
+    import requests
+    
+    fetch_url = fetch_url or url
+    state_path = Path(f"{dest_path}.part.json")
+    part_size = -(-total_size // parts)
+    ranges = [(start, min(start + part_size, total_size) - 1)
+              for start in range(0, total_size, part_size)]
+    
+    done = set()
+    if state_path.exists() and Path(dest_path).exists():
+        try:
+            state = json.loads(state_path.read_text())
+            if state.get('url') == url and state.get('size') == total_size:
+                done = {tuple(r) for r in state.get('done', [])}
+        except (OSError, ValueError):
+            pass
+    if not done:
+        with open(dest_path, 'wb') as f:
+            f.truncate(total_size)
+    
+    if done:
+        print(f"   Resuming: {len(done)}/{len(ranges)} parts already downloaded")
+    
+    lock = threading.Lock()
+    for attempt in range(2):
+        pending = [r for r in ranges if r not in done]
+        # Record every range that finishes, even after another one failed,
+        # so a re-run (or the retry below) doesn't fetch it again
+        error = None
+        with ThreadPoolExecutor(max_workers=parts) as executor:
+            futures = {executor.submit(_download_range, fetch_url, dest_path, start, end, retries, timeout): (start, end)
+                       for start, end in pending}
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                with lock:
+                    done.add(futures[future])
+                    state_path.write_text(json.dumps({'url': url, 'size': total_size, 'done': sorted(done)}))
+                    print(f"\r   Progress: {len(done)}/{len(ranges)} parts", end='', flush=True)
+        if error is None:
+            break
+        if attempt or not isinstance(error, requests.HTTPError) or not _signed_url_expired(error):
+            raise error
+        print("\n   Download URL expired; requesting a new one")
+        fetch_url, size, _ = probe_download(url, timeout)
+        if size != total_size:
+            raise error
+    
+    state_path.unlink()
+
+def _print_progress(downloaded, total_size, started):
+    """Print download progress with average throughput since `started`."""
+    elapsed = max(time.monotonic() - started, 1e-6)
+    mb_per_s = downloaded / elapsed / (1024 * 1024)
+    if total_size > 0:
+        percent = (downloaded / total_size) * 100
+        print(f"\r   Progress: {percent:.1f}% ({mb_per_s:.1f} MB/s)", end='', flush=True)
+    else:
+        print(f"\r   Downloaded: {downloaded / (1024 * 1024):.0f} MB ({mb_per_s:.1f} MB/s)", end='', flush=True)
+
+def probe_download(url, timeout=30):
+    """
+    HEAD the URL once: (final url, size, server accepts byte ranges).
+    
+    Returns (url, 0, False) if the HEAD request fails, so the download
+    falls back to a single streamed GET.
+    """
+    try:
+        head = get_session().head(url, allow_redirects=True, timeout=timeout)
+        head.raise_for_status()
+    except Exception:
+        return url, 0, False
+    total_size = int(head.headers.get('content-length', 0))
+    accepts_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+    return head.url, total_size, accepts_ranges
+
+def wants_parallel_download(probe, parts=4):
+    """True if a probed download should go to a path as parallel ranges."""
+    _, total_size, accepts_ranges = probe
+    return accepts_ranges and parts > 1 and total_size >= PARALLEL_DOWNLOAD_MIN_SIZE
 
-def download_file(url, dest_path):
-    """Download file from URL."""
+def download_file(url, dest, timeout=30, parts=4, retries=3, expected_sha256=None, probe=None):
+    """
+    Download file from URL into a path or a writable binary file object.
+    
+    Large files on servers that accept byte ranges are downloaded to a path
+    as `parts` parallel, resumable ranges; everything else is streamed in one
+    request. Failed requests are retried with exponential backoff. Pass the
+    result of probe_download as `probe` to skip a second HEAD request.
+    
+    The SHA-256 is computed while streaming and checked against
+    expected_sha256 when given; a mismatch fails the download.
+    """
     print(f"   Downloading from: {url}")
     print("   This may take a minute...")
     
     try:
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
+        probe = probe or probe_download(url, timeout)
+        final_url, total_size, _ = probe
         
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+        to_file_object = hasattr(dest, 'write')
+        started = time.monotonic()
+        downloaded = total_size
         
-        with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\r   Progress: {percent:.1f}%", end='', flush=True)
+        if not to_file_object and wants_parallel_download(probe, parts):
+            _download_ranges(url, dest, total_size, parts, retries, timeout, fetch_url=final_url)
+            # Ranges arrive out of order, so hash the finished file once
+            with open(dest, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                    digest = hashlib.file_digest(f, 'sha256').hexdigest()
+                else:
+                    sha256 = hashlib.sha256()
+                    for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                        sha256.update(block)
+                    digest = sha256.hexdigest()
+        else:
+            sha256 = hashlib.sha256()
+            response = _get_with_retry(url, retries, timeout)
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+            last_printed = 0
+            
+            # Chunks are already 1 MB, so skip Python's own write buffer
+            with (nullcontext(dest) if to_file_object else open(dest, 'wb', buffering=0)) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        downloaded += len(chunk)
+                        if downloaded - last_printed >= PROGRESS_INTERVAL_BYTES:
+                            # Only real files: fileno() would force a
+                            # SpooledTemporaryFile onto disk
+                            if not to_file_object:
+                                _drop_page_cache(f, 0, last_printed)
+                            last_printed = downloaded
+                            _print_progress(downloaded, total_size, started)
+                if not to_file_object:
+                    _drop_page_cache(f)
+            digest = sha256.hexdigest()
         
+        _print_progress(downloaded, total_size, started)
         print()  # New line after progress
+        
+        print(f"   SHA-256: {digest}")
+        if expected_sha256 and digest != expected_sha256.lower():
+            print(f"   ❌ Checksum mismatch (expected {expected_sha256})")
+            if not to_file_object:
+                Path(dest).unlink(missing_ok=True)
+            return False
+        if expected_sha256:
+            print("   ✅ Checksum matches the published digest")
+        else:
+            print("   ⚠️  No published checksum available; file not verified")
         return True
     except Exception as e:
         print(f"\n   ❌ Download failed: {e}")
         return False
 
-def extract_zip(zip_path, extract_to):
-    """Extract zip file."""
+def extract_zip(zip_source, extract_to):
+    """Extract zip file (path or seekable file object)."""
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
             zip_ref.extractall(extract_to)
         return True
     except Exception as e:
         print(f"   ❌ Extraction failed: {e}")
         return False
 
+def _fast_copy(src, dst):
+    """
+    Copy a file with os.sendfile (kernel-side, Linux) or a 4 MB buffered
+    copyfileobj elsewhere, then carry over timestamps like shutil.copy2.
+    """
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try:
+            size = os.fstat(s.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            s.seek(0)
+            d.seek(0)
+            d.truncate()
+            shutil.copyfileobj(s, d, length=COPY_BUFFER_SIZE)
+    shutil.copystat(src, dst)
+
 def copy_files(src_dir, pg_path):
     """Copy pgvector files to PostgreSQL directories."""
-    src_path = Path(src_dir)
+    # One walk over the extracted tree instead of an rglob per file type
+    found = {"dll": None, "control": None, "sql": []}
+    for root, _, files in os.walk(src_dir):
+        for name in files:
+            if name == "vector.dll":
+                found["dll"] = found["dll"] or Path(root) / name
+            elif name == "vector.control":
+                found["control"] = Path(root) / name
+            elif name.startswith("vector--") and name.endswith(".sql"):
+                found["sql"].append(Path(root) / name)
     
-    # Find vector.dll
-    dll_file = None
-    for file in src_path.rglob("vector.dll"):
-        dll_file = file
-        break
+    dll_file = found["dll"]
+    control_file = found["control"]
+    sql_files = found["sql"]
     
     if not dll_file:
         print("   ❌ vector.dll not found in extracted files")
         return False
     
-    # Find extension files
-    control_file = None
-    sql_files = []
-    for file in src_path.rglob("vector.control"):
-        control_file = file
-    for file in src_path.rglob("vector--*.sql"):
-        sql_files.append(file)
-    
     if not control_file:
         print("   ❌ vector.control not found in extracted files")
         return False
@@ -125,7 +451,7 @@ def copy_files(src_dir, pg_path):
     # Copy vector.dll to lib
     lib_dir = pg_path / "lib"
     try:
-        shutil.copy2(dll_file, lib_dir / "vector.dll")
+        _fast_copy(dll_file, lib_dir / "vector.dll")
         print(f"   ✅ Copied vector.dll to {lib_dir}")
     except PermissionError:
         print(f"   ❌ Permission denied copying to {lib_dir}")
@@ -138,11 +464,11 @@ def copy_files(src_dir, pg_path):
     # Copy extension files to share/extension
     ext_dir = pg_path / "share" / "extension"
     try:
-        shutil.copy2(control_file, ext_dir / "vector.control")
+        _fast_copy(control_file, ext_dir / "vector.control")
         print(f"   ✅ Copied vector.control to {ext_dir}")
         
         for sql_file in sql_files:
-            shutil.copy2(sql_file, ext_dir / sql_file.name)
+            _fast_copy(sql_file, ext_dir / sql_file.name)
             print(f"   ✅ Copied {sql_file.name} to {ext_dir}")
     except PermissionError:
         print(f"   ❌ Permission denied copying to {ext_dir}")
@@ -154,16 +480,60 @@ def copy_files(src_dir, pg_path):
     
     return True
 
+def _restart_service_win32(version, timeout=30):
+    """
+    Restart the PostgreSQL service through the Service Control Manager.
+    
+    Enumerates installed services once and waits on the service state
+    instead of spawning net.exe per guessed name. Only services for the
+    detected version are tried (that is the instance that got the pgvector
+    files). Returns True on success.
+    """
+    if not version:
+        return False
+    version_re = re.compile(rf"(?<!\d){re.escape(version)}(?!\d)")
+    
+    scm = win32service.OpenSCManager(None, None, win32service.SC_MANAGER_ENUMERATE_SERVICE)
+    try:
+        services = win32service.EnumServicesStatus(
+            scm, win32service.SERVICE_WIN32, win32service.SERVICE_STATE_ALL
+        )
+    finally:
+        win32service.CloseServiceHandle(scm)
+    
+    names = [name for name, _, _ in services
+             if name.lower().startswith("postgresql") and version_re.search(name)]
+    
+    for service_name in names:
+        try:
+            if win32serviceutil.QueryServiceStatus(service_name)[1] != win32service.SERVICE_STOPPED:
+                win32serviceutil.StopService(service_name)
+                win32serviceutil.WaitForServiceStatus(service_name, win32service.SERVICE_STOPPED, timeout)
+            win32serviceutil.StartService(service_name)
+            win32serviceutil.WaitForServiceStatus(service_name, win32service.SERVICE_RUNNING, timeout)
+            return True
+        except Exception:
+            continue
+    return False
+
 def restart_postgresql_service(version):
-    """Restart PostgreSQL service."""
+    """Restart PostgreSQL service (pywin32 if installed, else net stop/start)."""
+    print("   Restarting PostgreSQL service...")
+    
+    if win32service is not None:
+        try:
+            if _restart_service_win32(version):
+                print(f"   ✅ PostgreSQL service restarted")
+                return True
+        except Exception:
+            pass  # e.g. access denied opening the SCM; try net.exe below
+    
     service_names = [
         f"postgresql-x64-{version}",
         f"postgresql-x64-{version}-x64",
         f"postgresql-{version}-x64",
     ]
     
-    print("   Restarting PostgreSQL service...")
-    
     for service_name in service_names:
         try:
             # Stop service
@@ -189,6 +559,8 @@ def restart_postgresql_service(version):
 def enable_extension(host, port, database, user, password):
     """Enable pgvector extension in database."""
     try:
+        import psycopg2
+        
         conn = psycopg2.connect(
             host=host,
             port=port,
@@ -257,14 +629,35 @@ def main():
     if not skip_files:
         print()
         print("Step 2: Downloading pgvector...")
-        url, filename = get_pgvector_download_url(pg_version)
+        url, filename, tag = get_pgvector_download_url(pg_version)
+        
+        # Don't install an unverified build without asking
+        expected_sha256 = get_published_sha256(tag, filename)
+        if not expected_sha256:
+            print(f"   ⚠️  No published SHA-256 found for {filename}")
+            print("   The download can't be verified before it is installed")
+            response = input("   Install it unverified anyway? (y/n): ").strip().lower()
+            if response != 'y':
+                print("   ❌ Installation cancelled")
+                print("   💡 You can download and verify it manually from:")
+                print(f"      {url}")
+                return 1
         
         # Create temp directory
         temp_dir = Path("temp_pgvector")
         temp_dir.mkdir(exist_ok=True)
-        zip_path = temp_dir / filename
         
-        if not download_file(url, zip_path):
+        # Large files on range-capable servers go to disk as parallel,
+        # resumable ranges (a re-run after a failure picks up the partial
+        # file in temp_dir). Otherwise keep the zip in memory and extract
+        # straight from it; an unexpectedly large one spills to a temp file.
+        probe = probe_download(url)
+        if wants_parallel_download(probe):
+            zip_source = temp_dir / filename
+        else:
+            zip_source = tempfile.SpooledTemporaryFile(max_size=IN_MEMORY_ZIP_MAX_SIZE, dir=temp_dir)
+        
+        if not download_file(url, zip_source, expected_sha256=expected_sha256, probe=probe):
             print()
             print("   ❌ Download failed")
             print("   💡 You can download manually from:")
@@ -279,7 +672,13 @@ def main():
         extract_dir = temp_dir / "extracted"
         extract_dir.mkdir(exist_ok=True)
         
-        if not extract_zip(zip_path, extract_dir):
+        in_memory = not isinstance(zip_source, Path)
+        if in_memory:
+            zip_source.seek(0)
+        extracted = extract_zip(zip_source, extract_dir)
+        if in_memory:
+            zip_source.close()
+        if not extracted:
             return 1
         
         print("   ✅ Extraction complete")
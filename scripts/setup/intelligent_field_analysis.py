@@ -8,23 +8,53 @@ Key improvements:
 4. More robust pattern matching
 """
 import psycopg2
-from typing import Dict, List, Tuple, Optional
-import re
+from psycopg2 import sql
 from collections import Counter
+from typing import Callable, Dict, List, Tuple, Optional
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+_CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+# Field name separators -> spaces, in one pass
+_SEP_TRANS = str.maketrans('_-.', '   ')
+
+
+def _table_identifier(table_name: str) -> sql.Identifier:
+    """Quoted identifier for a table name, optionally schema-qualified."""
+    return sql.Identifier(*table_name.split('.'))
 
 
 class IntelligentFieldAnalyzer:
     """Analyze table fields to suggest optimal embedding weights."""
     
-    def __init__(self, cursor):
+    def __init__(self, cursor, conn_factory: Optional[Callable] = None, max_workers: int = 8):
+        """
+        Args:
+            cursor: Cursor used for schema/count queries (and data analysis
+                when no conn_factory is given)
+            conn_factory: Optional callable returning a new psycopg2
+                connection; when set, columns are analyzed in parallel, one
+                connection per worker thread (connections aren't thread-safe)
+            max_workers: Worker threads for parallel column analysis
+        """
         self.cursor = cursor
+        self.conn_factory = conn_factory
+        self.max_workers = max_workers
+        # Per-table caches for repeated analyze_table calls
+        self._schema_cache: Dict[str, List[Dict]] = {}
+        self._row_count_cache: Dict[str, int] = {}
     
     # ============================================================================
     # COLUMN NAME PATTERNS (Universal - works for any table)
     # ============================================================================
     
     # Core semantic words (language-agnostic patterns)
-    CRITICAL_WORDS = {
+    CRITICAL_WORDS = frozenset({
         # Names and titles
         'name', 'title', 'subject', 'topic', 'label', 'nm', 'nm_',
         # Descriptions and content
@@ -37,9 +67,9 @@ class IntelligentFieldAnalyzer:
         'area', 'location', 'region', 'zone', 'district', 'addr', 'address',
         # Summary fields
         'summary', 'overview', 'abstract'
-    }
+    })
     
-    IMPORTANT_WORDS = {
+    IMPORTANT_WORDS = frozenset({
         # Dates and times
         'date', 'dt', 'time', 'tm', 'created', 'updated', 'modified', 'changed', 'closed', 'opened',
         # Contact information
@@ -48,22 +78,34 @@ class IntelligentFieldAnalyzer:
         'status', 'stat', 'state', 'phase', 'stage', 'step', 'type', 'typ',
         # Quantities
         'amount', 'quantity', 'count', 'total', 'sum', 'value', 'price', 'cost'
-    }
+    })
     
-    SUPPORTING_WORDS = {
+    SUPPORTING_WORDS = frozenset({
         'detail', 'info', 'data', 'field', 'attribute', 'property', 'flag'
+    })
+    
+    # Word -> name weight (3 critical, 2 important, 1 supporting); higher
+    # classes are merged last so they win if a word is in several sets
+    WORD_CLASS = {
+        **{w: 1 for w in SUPPORTING_WORDS},
+        **{w: 2 for w in IMPORTANT_WORDS},
+        **{w: 3 for w in CRITICAL_WORDS},
     }
+    WORD_CLASS_NAMES = {3: 'critical', 2: 'important', 1: 'supporting'}
     
-    EXCLUDE_WORDS = {
-        '_id', '_uuid', '_guid', 'id', 'uuid', 'guid',
+    # Whole words (after splitting the name) that exclude a column...
+    EXCLUDE_TOKENS = frozenset({
+        'id', 'uuid', 'guid',
         'password', 'secret', 'token', 'key', 'hash',
         'image', 'photo', 'file', 'attachment', 'blob', 'binary'
-    }
+    })
+    # ...and name suffixes that do
+    EXCLUDE_SUFFIXES = ('_id', '_uuid', '_guid')
     
-    LOW_PRIORITY_WORDS = {
+    LOW_PRIORITY_WORDS = frozenset({
         'x', 'y', 'lat', 'lon', 'latitude', 'longitude', 'coord',
         'version', 'build', 'revision'
-    }
+    })
     
     # Abbreviation expansion map
     ABBREV_MAP = {
@@ -73,11 +115,53 @@ class IntelligentFieldAnalyzer:
         'emp': 'employee', 'cont': 'contact', 'stat': 'status',
         'typ': 'type', 'rem': 'remark', 'cmt': 'comment', 'txt': 'text'
     }
+    # ============================================================================
+    # FINAL WEIGHT ROUNDING
+    # ============================================================================
+    
+    # Name weight bands: < 2.0 (data-driven), 2.0-3.0 (important), >= 3.0 (critical)
+    NAME_WEIGHT_BANDS = np.array([2.0, 3.0])
+    # Per band: combined-weight cutoffs, and the final weight below the first
+    # cutoff / after each cutoff reached (-inf pads bands with fewer steps)
+    FINAL_WEIGHT_CUTOFFS = np.array([
+        [0.8, 1.5, 2.0],
+        [-np.inf, 1.2, 2.0],
+        [-np.inf, 1.5, 2.3],
+    ])
+    FINAL_WEIGHTS = np.array([
+        [0.0, 0.5, 1.0, 2.0],
+        [0.5, 0.5, 1.0, 2.0],
+        [1.0, 1.0, 2.0, 3.0],
+    ])
+    RECOMMENDATION_CUTOFFS = np.array([0.8, 1.5, 2.5])
+    RECOMMENDATIONS = ('LOW (0.5x)', 'SUPPORTING (1.0x)', 'IMPORTANT (2.0x)', 'CRITICAL (3.0x)')
+    
+    # Distinct values whose frequencies enter the entropy exactly; the rest
+    # are treated as one evenly spread tail
+    ENTROPY_TOP_K = 32
+    
+    # Rows per round trip when streaming sampled value counts
+    SAMPLE_FETCH_SIZE = 1000
+    
+    # information_schema data_type values grouped in SQL on their text form.
+    # Other types (booleans, numbers, timestamps, ...) print differently in
+    # PostgreSQL than with Python's str(), so they are grouped in Python
+    SQL_GROUPED_TYPES = frozenset({'text', 'character varying', 'character'})
     
-    def normalize_field_name(self, column_name: str) -> List[str]:
+    # Longest abbreviation first, so a prefix match picks the most specific one
+    ABBREV_PREFIX_RE = re.compile(
+        '^(' + '|'.join(re.escape(k) for k in sorted(ABBREV_MAP, key=len, reverse=True)) + ')'
+    )
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def normalize_field_name(column_name: str) -> Tuple[str, ...]:
         """
         Normalize field name to extract meaningful words.
         
+        Cached: the result depends only on the name and the class constants,
+        and names like created_at/status repeat across tables.
+        
         Handles:
         - snake_case: project_name -> ['project', 'name']
         - camelCase: projectName -> ['project', 'name']
@@ -85,65 +169,78 @@ class IntelligentFieldAnalyzer:
         - no_case: projectname -> ['project', 'name'] (if we can detect)
         - Abbreviations: proj_nm -> ['project', 'name']
         """
-        name = column_name.lower()
-        
         # Check exclude patterns first
-        for exclude in self.EXCLUDE_WORDS:
-            if exclude in name:
-                return []  # Will be excluded
+        if IntelligentFieldAnalyzer.find_excluded(column_name):
+            return ()  # Will be excluded
         
-        # Replace separators with spaces
-        name = name.replace('_', ' ').replace('-', ' ').replace('.', ' ')
-        
-        # Handle camelCase/PascalCase
-        if '_' not in column_name and '-' not in column_name:
-            # Insert space before capital letters
-            name = re.sub(r'([a-z])([A-Z])', r'\1 \2', column_name).lower()
-        
-        # Split into words
-        words = name.split()
+        words = IntelligentFieldAnalyzer.split_field_name(column_name)
         
         # Expand abbreviations
         expanded_words = []
         for word in words:
             # Check if word is an abbreviation
-            if word in self.ABBREV_MAP:
-                expanded_words.append(self.ABBREV_MAP[word])
-            # Check if word starts with abbreviation pattern
-            elif any(word.startswith(abbrev) for abbrev in self.ABBREV_MAP.keys()):
-                # Try to match: proj -> project
-                for abbrev, full in self.ABBREV_MAP.items():
-                    if word.startswith(abbrev):
-                        expanded_words.append(full)
-                        break
+            if word in IntelligentFieldAnalyzer.ABBREV_MAP:
+                expanded_words.append(IntelligentFieldAnalyzer.ABBREV_MAP[word])
+            # Check if word starts with abbreviation pattern: proj -> project
+            elif (match := IntelligentFieldAnalyzer.ABBREV_PREFIX_RE.match(word)):
+                expanded_words.append(IntelligentFieldAnalyzer.ABBREV_MAP[match.group(1)])
             else:
                 expanded_words.append(word)
         
-        return expanded_words
+        return tuple(expanded_words)
     
-    def analyze_field_name(self, column_name: str, data_type: str) -> Tuple[float, str]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def split_field_name(column_name: str) -> Tuple[str, ...]:
+        """Split a field name into lowercase words (separators and camelCase), without expanding abbreviations."""
+        name = column_name.lower()
+        
+        # Replace separators with spaces
+        name = name.translate(_SEP_TRANS)
+        
+        # Handle camelCase/PascalCase
+        if '_' not in column_name and '-' not in column_name:
+            # Insert space before capital letters
+            name = _CAMEL_RE.sub(r'\1 \2', column_name).lower()
+        
+        # Split into words
+        return tuple(name.split())
+    
+    @staticmethod
+    def find_excluded(column_name: str) -> Optional[str]:
+        """Return the exclude suffix or word found in a field name, or None."""
+        name_lower = column_name.lower()
+        if name_lower.endswith(IntelligentFieldAnalyzer.EXCLUDE_SUFFIXES):
+            return next(s for s in IntelligentFieldAnalyzer.EXCLUDE_SUFFIXES if name_lower.endswith(s))
+        words = IntelligentFieldAnalyzer.split_field_name(column_name)
+        return next((w for w in words if w in IntelligentFieldAnalyzer.EXCLUDE_TOKENS), None)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def analyze_field_name(column_name: str, data_type: str) -> Tuple[float, str]:
         """
-        Analyze column name to suggest importance weight.
+        Analyze column name to suggest importance weight (cached).
         
         Returns:
             (weight: float, reason: str)
         """
         name_lower = column_name.lower()
         
-        # Check exclude patterns first
-        for exclude in self.EXCLUDE_WORDS:
-            if exclude in name_lower:
-                return (0.0, f"Excluded: contains '{exclude}'")
+        # Check exclude patterns first (whole words / suffixes, so names
+        # like 'keyword' or 'valid_from' aren't excluded by a substring)
+        exclude = IntelligentFieldAnalyzer.find_excluded(column_name)
+        if exclude:
+            return (0.0, f"Excluded: contains '{exclude}'")
         
         # Normalize to extract words FIRST (before checking low priority patterns)
-        words = self.normalize_field_name(column_name)
+        words = IntelligentFieldAnalyzer.normalize_field_name(column_name)
         
         if not words:
             # If normalization failed (excluded), return 0
             return (0.0, "Excluded by normalization")
         
         # Check low priority patterns AFTER normalization (exact word match only)
-        for pattern in self.LOW_PRIORITY_WORDS:
+        for pattern in IntelligentFieldAnalyzer.LOW_PRIORITY_WORDS:
             # Check if pattern is an exact word match (not substring)
             if any(word == pattern for word in words):
                 return (0.5, f"Low priority: exact match '{pattern}'")
@@ -157,22 +254,20 @@ class IntelligentFieldAnalyzer:
             else:
                 return (0.0, "Foreign key ID (excluded)")
         
-        # Check words against patterns (EXACT word matching, not substring)
-        critical_matched_words = [w for w in words if w in self.CRITICAL_WORDS]
-        important_matched_words = [w for w in words if w in self.IMPORTANT_WORDS]
-        supporting_matched_words = [w for w in words if w in self.SUPPORTING_WORDS]
-        
-        critical_matches = len(critical_matched_words)
-        important_matches = len(important_matched_words)
-        supporting_matches = len(supporting_matched_words)
+        # Check words against patterns (EXACT word matching, not substring),
+        # one lookup per word, grouped by class
+        matched_words = {}
+        for w in words:
+            word_class = IntelligentFieldAnalyzer.WORD_CLASS.get(w)
+            if word_class:
+                matched_words.setdefault(word_class, []).append(w)
         
-        # Determine weight based on matches
-        if critical_matches > 0:
-            return (3.0, f"Critical: contains {critical_matches} critical word(s): {critical_matched_words}")
-        elif important_matches > 0:
-            return (2.0, f"Important: contains {important_matches} important word(s): {important_matched_words}")
-        elif supporting_matches > 0:
-            return (1.0, f"Supporting: contains {supporting_matches} supporting word(s): {supporting_matched_words}")
+        # Determine weight from the highest class matched
+        if matched_words:
+            best = max(matched_words)
+            class_name = IntelligentFieldAnalyzer.WORD_CLASS_NAMES[best]
+            best_words = matched_words[best]
+            return (float(best), f"{class_name.capitalize()}: contains {len(best_words)} {class_name} word(s): {best_words}")
         
         # No pattern match - fall back to data type
         if 'text' in data_type.lower() or 'varchar' in data_type.lower() or 'char' in data_type.lower():
@@ -182,18 +277,24 @@ class IntelligentFieldAnalyzer:
         else:
             return (0.5, f"Non-text field: {data_type}")
     
-    def analyze_data_quality(self, table_name: str, column_name: str, sample_size: int = 1000) -> Dict:
+    def analyze_data_quality(self, table_name: str, column_name: str, sample_size: int = 1000,
+                             total_table_rows: Optional[int] = None,
+                             non_null_count_total: Optional[int] = None) -> Dict:
         """
         Analyze actual data to determine importance.
         This is the FALLBACK when field names don't match patterns.
         
+        analyze_table passes in the row and non-null counts it fetched for
+        all columns at once; standalone calls query them here.
+        
         Returns:
             Dict with coverage, uniqueness, diversity, avg_length, and calculated score
         """
         try:
             # Get total row count FIRST (for accurate coverage calculation)
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            total_table_rows = self.cursor.fetchone()[0]
+            if total_table_rows is None:
+                self.cursor.execute(sql.SQL("SELECT COUNT(*) FROM {};").format(_table_identifier(table_name)))
+                total_table_rows = self.cursor.fetchone()[0]
             
             if total_table_rows == 0:
                 return {
@@ -205,20 +306,18 @@ class IntelligentFieldAnalyzer:
                 }
             
             # Get non-null count
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {column_name} IS NOT NULL;")
-            non_null_count_total = self.cursor.fetchone()[0]
+            if non_null_count_total is None:
+                self.cursor.execute(sql.SQL("SELECT COUNT({}) FROM {};").format(
+                    sql.Identifier(column_name), _table_identifier(table_name)
+                ))
+                non_null_count_total = self.cursor.fetchone()[0]
             
-            # Get sample data for analysis (non-null values only)
-            self.cursor.execute(f"""
-                SELECT {column_name}
-                FROM {table_name}
-                WHERE {column_name} IS NOT NULL
-                LIMIT {sample_size * 2}
-            """)
-            rows = self.cursor.fetchall()
+            # Per-value frequencies of the sample, grouped in the database:
+            # only (count, length) pairs come back, never the values
+            rows = self.fetch_value_counts(table_name, column_name, sample_size, total_table_rows)
             
-            if not rows:
-                # No non-null values
+            if len(rows) == 0:
+                # No non-empty values
                 return {
                     'coverage': 0.0,
                     'uniqueness': 0.0,
@@ -227,46 +326,25 @@ class IntelligentFieldAnalyzer:
                     'score': 0.0
                 }
             
-            # Convert to strings and filter (remove empty strings)
-            values = []
-            for row in rows:
-                if row[0] is not None:
-                    value_str = str(row[0]).strip()
-                    if value_str:  # Only add non-empty strings
-                        values.append(value_str)
-            
-            if not values:
-                return {
-                    'coverage': 0.0,
-                    'uniqueness': 0.0,
-                    'diversity': 0.0,
-                    'avg_length': 0.0,
-                    'score': 0.0
-                }
+            counts, lengths = rows[:, 0], rows[:, 1]
+            value_total = int(counts.sum())
             
             # Calculate metrics
             # Coverage: non-null rows / total rows
             coverage = non_null_count_total / total_table_rows if total_table_rows > 0 else 0.0
             
             # Uniqueness
-            unique_count = len(set(values))
-            uniqueness = unique_count / len(values) if len(values) > 0 else 0.0
+            unique_count = len(counts)
+            uniqueness = unique_count / value_total
             
             # Diversity (entropy) - measure of how evenly distributed values are
-            value_counts = Counter(values)
-            if len(value_counts) > 1:
-                total = sum(value_counts.values())
-                # Calculate Shannon entropy
-                import math
-                entropy = -sum((count / total) * math.log2(count / total) for count in value_counts.values())
-                # Normalize: max entropy is log2(number of unique values)
-                max_entropy = math.log2(len(value_counts)) if len(value_counts) > 1 else 1.0
-                diversity = entropy / max_entropy if max_entropy > 0 else 0.0
+            if unique_count > 1:
+                diversity = self.normalized_entropy(counts, value_total)
             else:
                 diversity = 0.0  # All same value = no diversity
             
             # Average text length
-            avg_length = sum(len(v) for v in values) / len(values) if values else 0.0
+            avg_length = float((counts * lengths).sum() / value_total)
             
             # Calculate importance score
             length_factor = min(avg_length / 50.0, 1.0)
@@ -290,6 +368,171 @@ class IntelligentFieldAnalyzer:
                 'error': str(e)
             }
     
+    @classmethod
+    def normalized_entropy(cls, counts: np.ndarray, value_total: int) -> float:
+        """
+        Shannon entropy of a value distribution, normalized by its maximum
+        log2(unique values).
+        
+        Only the ENTROPY_TOP_K most common values are summed exactly; the
+        remaining values are assumed to share the leftover probability
+        evenly. Exact up to K distinct values (and for all-unique free
+        text), and O(K) however large the sample gets.
+        """
+        unique_count = len(counts)
+        top = counts
+        if unique_count > cls.ENTROPY_TOP_K:
+            top = np.partition(counts, -cls.ENTROPY_TOP_K)[-cls.ENTROPY_TOP_K:]
+        
+        p = top / value_total
+        entropy = float(-(p * np.log2(p)).sum())
+        
+        rest = unique_count - len(top)
+        if rest:
+            p_rest = (value_total - int(top.sum())) / value_total
+            entropy -= p_rest * float(np.log2(p_rest / rest))
+        
+        # Normalize: max entropy is log2(number of unique values)
+        max_entropy = float(np.log2(unique_count))
+        return entropy / max_entropy if max_entropy > 0 else 0.0
+    
+    def fetch_value_counts(self, table_name: str, column_name: str, sample_size: int,
+                           total_table_rows: int) -> np.ndarray:
+        """
+        Sample up to sample_size * 2 non-null values of a column and return
+        (count, length) for each distinct non-empty (trimmed) value, as an
+        (n, 2) int64 array.
+        
+        Text columns are grouped in the database, so only the counts come
+        back. Other types are fetched and grouped on str(value), which is
+        what lengths and distinct values are defined by.
+        
+        TABLESAMPLE SYSTEM reads a random subset of heap pages sized to
+        yield about 4x the sample, instead of scanning from the start of
+        the table (which is both slow and biased towards the oldest rows).
+        Falls back to a plain LIMIT where TABLESAMPLE isn't allowed (views).
+        """
+        pct = min(100.0, max(0.1, sample_size * 4.0 / total_table_rows * 100))
+        column_types = {col['name']: col['type'] for col in self.get_table_schema(table_name)}
+        if column_types.get(column_name) in self.SQL_GROUPED_TYPES:
+            fetch = self.stream_counts
+            query = sql.SQL("""
+                SELECT COUNT(*), length(v)
+                FROM (
+                    SELECT NULLIF(btrim({column}::text, E' \\t\\r\\n'), '') AS v
+                    FROM {table}{tablesample}
+                    WHERE {column} IS NOT NULL
+                    LIMIT {limit}
+                ) sample
+                WHERE v IS NOT NULL
+                GROUP BY v
+            """)
+        else:
+            fetch = self.stream_value_counts
+            query = sql.SQL("""
+                SELECT {column}
+                FROM {table}{tablesample}
+                WHERE {column} IS NOT NULL
+                LIMIT {limit}
+            """)
+        params = {
+            'column': sql.Identifier(column_name),
+            'table': _table_identifier(table_name),
+            'limit': sql.Literal(sample_size * 2),
+        }
+        
+        self.cursor.execute("SAVEPOINT field_sample;")
+        try:
+            rows = fetch(query.format(
+                tablesample=sql.SQL(" TABLESAMPLE SYSTEM ({})").format(sql.Literal(pct)), **params
+            ))
+            self.cursor.execute("RELEASE SAVEPOINT field_sample;")
+            return rows
+        except psycopg2.Error:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT field_sample;")
+        
+        return fetch(query.format(tablesample=sql.SQL(""), **params))
+    
+    def stream_counts(self, query: sql.Composable) -> np.ndarray:
+        """
+        Run a (count, length) query through a server-side cursor.
+        
+        Rows are pulled SAMPLE_FETCH_SIZE at a time and packed straight into
+        an int64 array, so no list of row tuples is ever built.
+        """
+        named_cursor = self.cursor.connection.cursor(name='field_sample_counts')
+        named_cursor.itersize = self.SAMPLE_FETCH_SIZE
+        named_cursor.execute(query)
+        flat = np.fromiter(chain.from_iterable(named_cursor), dtype=np.int64)
+        # Only closed on success: after an error the transaction is aborted
+        # and rolling back to the caller's savepoint drops the cursor anyway
+        named_cursor.close()
+        return flat.reshape(-1, 2)
+    
+    def stream_value_counts(self, query: sql.Composable) -> np.ndarray:
+        """
+        Run a single-column value query through a server-side cursor and
+        group the values on str(value).strip() in Python.
+        
+        Returns the same (count, length) array as stream_counts.
+        """
+        named_cursor = self.cursor.connection.cursor(name='field_sample_values')
+        named_cursor.itersize = self.SAMPLE_FETCH_SIZE
+        named_cursor.execute(query)
+        value_counts = Counter(str(row[0]).strip() for row in named_cursor)
+        named_cursor.close()
+        value_counts.pop('', None)
+        return np.array(
+            [(count, len(value)) for value, count in value_counts.items()], dtype=np.int64
+        ).reshape(-1, 2)
+    
+    def analyze_columns_data(self, table_name: str, column_names: List[str], sample_size: int,
+                             total_rows: int, non_null_counts: Dict[str, int]) -> Dict[str, Dict]:
+        """
+        Run analyze_data_quality for each column.
+        
+        Columns are independent, so with a conn_factory they run concurrently
+        (overlapping the per-column query latency); otherwise sequentially
+        on self.cursor.
+        
+        Returns:
+            {column_name: data_analysis}
+        """
+        def analyze(analyzer, column_name):
+            return analyzer.analyze_data_quality(
+                table_name, column_name, sample_size,
+                total_table_rows=total_rows,
+                non_null_count_total=non_null_counts.get(column_name)
+            )
+        
+        if self.conn_factory is None or len(column_names) < 2:
+            return {column_name: analyze(self, column_name) for column_name in column_names}
+        
+        local = threading.local()
+        connections = []
+        lock = threading.Lock()
+        
+        def analyze_in_worker(column_name):
+            # One connection (and analyzer) per worker thread, reused across columns
+            if not hasattr(local, 'analyzer'):
+                local.conn = self.conn_factory()
+                with lock:
+                    connections.append(local.conn)
+                local.analyzer = IntelligentFieldAnalyzer(local.conn.cursor())
+            try:
+                return analyze(local.analyzer, column_name)
+            finally:
+                # End the (read-only) transaction per column so a long analysis
+                # doesn't hold a snapshot open and hold back vacuum
+                local.conn.commit()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(column_names))) as executor:
+                return dict(zip(column_names, executor.map(analyze_in_worker, column_names)))
+        finally:
+            for conn in connections:
+                conn.close()
+    
     def analyze_table(self, table_name: str, sample_size: int = 1000) -> Dict:
         """
         Analyze entire table to suggest field weights.
@@ -298,40 +541,37 @@ class IntelligentFieldAnalyzer:
         relies more heavily on data analysis.
         """
         # Get table schema
-        self.cursor.execute("""
-            SELECT 
-                column_name,
-                data_type,
-                is_nullable
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position;
-        """, (table_name,))
-        
-        columns = []
-        for row in self.cursor.fetchall():
-            columns.append({
-                'name': row[0],
-                'type': row[1],
-                'nullable': row[2] == 'YES'
-            })
+        columns = self.get_table_schema(table_name)
         
         if not columns:
             return {'error': f'Table {table_name} not found or has no columns'}
         
-        # Get total row count
-        total_rows = self.get_total_row_count(table_name)
+        # Name-based analysis (no database access)
+        name_results = [self.analyze_field_name(col['name'], col['type']) for col in columns]
+        
+        # Total rows and every analyzed column's non-null count in one scan
+        data_columns = [col['name'] for col, (name_weight, _) in zip(columns, name_results) if name_weight != 0.0]
+        total_rows, non_null_counts = self.get_column_counts(table_name, data_columns)
         actual_sample_size = min(sample_size, total_rows) if total_rows > 0 else sample_size
         
+        # Data-based analysis. A critical name (3.0) always ends at 3.0:
+        # combined = 2.1 + 0.3 * (1 + 2 * score) >= 2.4 for any score, so
+        # those columns skip the sample and only report coverage ('sampled': False)
+        sampled_columns = [
+            col['name'] for col, (name_weight, _) in zip(columns, name_results)
+            if name_weight != 0.0 and (name_weight < 3.0 or col['name'] not in non_null_counts)
+        ]
+        data_analyses = self.analyze_columns_data(
+            table_name, sampled_columns, actual_sample_size, total_rows, non_null_counts
+        )
+        
         # Analyze each column
         results = []
-        for col in columns:
+        pending = []  # (index in results, name weight, data score)
+        for col, (name_weight, name_reason) in zip(columns, name_results):
             col_name = col['name']
             col_type = col['type']
             
-            # Name-based analysis
-            name_weight, name_reason = self.analyze_field_name(col_name, col_type)
-            
             # Skip if excluded
             if name_weight == 0.0:
                 results.append({
@@ -345,67 +585,58 @@ class IntelligentFieldAnalyzer:
                 })
                 continue
             
-            # Data-based analysis
-            data_analysis = self.analyze_data_quality(table_name, col_name, actual_sample_size)
+            # Critical name - no sample needed (see above)
+            if col_name not in data_analyses:
+                coverage = non_null_counts[col_name] / total_rows if total_rows > 0 else 0.0
+                results.append({
+                    'column': col_name,
+                    'type': col_type,
+                    'name_weight': name_weight,
+                    'name_reason': name_reason,
+                    # Only coverage is known; consumers check 'sampled' before reading the rest
+                    'data_analysis': {'coverage': coverage, 'sampled': False},
+                    'final_weight': 3.0,
+                    'recommendation': 'CRITICAL (3.0x)'
+                })
+                continue
             
-            # IMPROVED: Adjust weight combination based on name match quality
-            # If name doesn't match patterns well (weight < 2.0), trust data more
+            data_analysis = data_analyses[col_name]
             if name_weight < 2.0:
-                # Name didn't match well - trust data more (40% name, 60% data)
-                data_weight = 1.0 + (data_analysis['score'] * 2.0)
-                combined_weight = (name_weight * 0.4) + (data_weight * 0.6)
                 name_reason += " (low name match - using data-driven analysis)"
-            else:
-                # Name matched well - trust name more (70% name, 30% data)
-                data_weight = 1.0 + (data_analysis['score'] * 2.0)
-                combined_weight = (name_weight * 0.7) + (data_weight * 0.3)
-            
-            # Round to final weight
-            if name_weight >= 3.0:
-                if combined_weight >= 2.3:
-                    final_weight = 3.0
-                elif combined_weight >= 1.5:
-                    final_weight = 2.0
-                else:
-                    final_weight = 1.0
-            elif name_weight >= 2.0:
-                if combined_weight >= 2.0:
-                    final_weight = 2.0
-                elif combined_weight >= 1.2:
-                    final_weight = 1.0
-                else:
-                    final_weight = 0.5
-            else:
-                # Name didn't match - data-driven
-                if combined_weight >= 2.0:
-                    final_weight = 2.0
-                elif combined_weight >= 1.5:
-                    final_weight = 1.0
-                elif combined_weight >= 0.8:
-                    final_weight = 0.5
-                else:
-                    final_weight = 0.0
-            
-            # Determine recommendation
-            if final_weight >= 2.5:
-                recommendation = 'CRITICAL (3.0x)'
-            elif final_weight >= 1.5:
-                recommendation = 'IMPORTANT (2.0x)'
-            elif final_weight >= 0.8:
-                recommendation = 'SUPPORTING (1.0x)'
-            else:
-                recommendation = 'LOW (0.5x)'
             
+            # Final weight is filled in below for all columns at once
+            pending.append((len(results), name_weight, data_analysis['score']))
             results.append({
                 'column': col_name,
                 'type': col_type,
                 'name_weight': name_weight,
                 'name_reason': name_reason,
                 'data_analysis': data_analysis,
-                'final_weight': final_weight,
-                'recommendation': recommendation
+                'final_weight': None,
+                'recommendation': None
             })
         
+        if pending:
+            indexes, name_weights, scores = (np.array(v) for v in zip(*pending))
+            
+            # IMPROVED: Adjust weight combination based on name match quality.
+            # If name doesn't match patterns well (weight < 2.0), trust data
+            # more (40% name, 60% data); otherwise 70% name, 30% data
+            data_weights = 1.0 + scores * 2.0
+            low_match = name_weights < 2.0
+            combined = (name_weights * np.where(low_match, 0.4, 0.7)
+                        + data_weights * np.where(low_match, 0.6, 0.3))
+            
+            # Round combined weights to final weights: pick the band row by name
+            # weight, count the cutoffs reached, and look the weight up
+            bands = np.digitize(name_weights, self.NAME_WEIGHT_BANDS)
+            steps = (combined[:, None] >= self.FINAL_WEIGHT_CUTOFFS[bands]).sum(axis=1)
+            final_weights = self.FINAL_WEIGHTS[bands, steps]
+            recommendations = np.digitize(final_weights, self.RECOMMENDATION_CUTOFFS)
+            for i, final_weight, rec in zip(indexes, final_weights, recommendations):
+                results[i]['final_weight'] = float(final_weight)
+                results[i]['recommendation'] = self.RECOMMENDATIONS[rec]
+        
         # Sort by final weight
         results.sort(key=lambda x: x['final_weight'], reverse=True)
         
@@ -418,13 +649,91 @@ class IntelligentFieldAnalyzer:
             'results': results
         }
     
+    def get_column_counts(self, table_name: str, column_names: List[str]) -> Tuple[int, Dict[str, int]]:
+        """
+        Get total row count and per-column non-null counts with a single
+        aggregate (one heap scan instead of one COUNT(*) per column).
+        
+        Returns:
+            (total_rows, {column_name: non_null_count})
+        """
+        counts = sql.SQL('').join(
+            sql.SQL(", COUNT({})").format(sql.Identifier(column_name)) for column_name in column_names
+        )
+        # Savepoint keeps the transaction usable for the fallback if the aggregate fails
+        self.cursor.execute("SAVEPOINT column_counts;")
+        try:
+            self.cursor.execute(sql.SQL("SELECT COUNT(*){} FROM {};").format(counts, _table_identifier(table_name)))
+            row = self.cursor.fetchone()
+            self.cursor.execute("RELEASE SAVEPOINT column_counts;")
+        except psycopg2.Error:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT column_counts;")
+            return self.get_total_row_count(table_name), {}
+        self._row_count_cache[table_name] = row[0]  # exact, better than the estimate
+        return row[0], dict(zip(column_names, row[1:]))
+    
+    def get_table_schema(self, table_name: str) -> List[Dict]:
+        """Get column name/type/nullable for a table (cached per analyzer)."""
+        if table_name not in self._schema_cache:
+            self.cursor.execute("""
+                SELECT 
+                    column_name,
+                    data_type,
+                    is_nullable
+                FROM information_schema.columns
+                WHERE table_name = %s
+                ORDER BY ordinal_position;
+            """, (table_name,))
+            
+            self._schema_cache[table_name] = [
+                {'name': row[0], 'type': row[1], 'nullable': row[2] == 'YES'}
+                for row in self.cursor.fetchall()
+            ]
+        return self._schema_cache[table_name]
+    
+    def prefetch_table_schemas(self, table_names: List[str]) -> None:
+        """Fill the schema cache for several tables with one catalog query."""
+        missing = [t for t in table_names if t not in self._schema_cache]
+        if not missing:
+            return
+        self.cursor.execute("""
+            SELECT 
+                table_name,
+                column_name,
+                data_type,
+                is_nullable
+            FROM information_schema.columns
+            WHERE table_name = ANY(%s)
+            ORDER BY table_name, ordinal_position;
+        """, (missing,))
+        
+        schemas = {t: [] for t in missing}
+        for row in self.cursor.fetchall():
+            schemas[row[0]].append({'name': row[1], 'type': row[2], 'nullable': row[3] == 'YES'})
+        self._schema_cache.update(schemas)
+    
     def get_total_row_count(self, table_name: str) -> int:
-        """Get total row count for a table."""
+        """
+        Get (approximate) total row count for a table, cached per analyzer.
+        
+        Uses the planner's pg_class.reltuples estimate (no scan); falls back
+        to COUNT(*) only when the table has never been analyzed.
+        """
+        if table_name in self._row_count_cache:
+            return self._row_count_cache[table_name]
         try:
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            return self.cursor.fetchone()[0]
+            self.cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;", (table_name,)
+            )
+            row = self.cursor.fetchone()
+            count = row[0] if row else -1
+            if count <= 0:
+                self.cursor.execute(sql.SQL("SELECT COUNT(*) FROM {};").format(_table_identifier(table_name)))
+                count = self.cursor.fetchone()[0]
         except:
             return 0
+        self._row_count_cache[table_name] = count
+        return count
     
     def generate_weight_config(self, analysis_result: Dict) -> Dict:
         """Generate weight configuration from analysis results."""
@@ -454,9 +763,10 @@ class IntelligentFieldAnalyzer:
         return weights
 
 
-def analyze_table_fields(cursor, table_name: str, sample_size: int = 1000) -> Dict:
-    """Main function to analyze table fields."""
-    analyzer = IntelligentFieldAnalyzer(cursor)
+def analyze_table_fields(cursor, table_name: str, sample_size: int = 1000,
+                         conn_factory: Optional[Callable] = None) -> Dict:
+    """Main function to analyze table fields (see IntelligentFieldAnalyzer for conn_factory)."""
+    analyzer = IntelligentFieldAnalyzer(cursor, conn_factory=conn_factory)
     analysis = analyzer.analyze_table(table_name, sample_size)
     
     if 'error' in analysis:
@@ -470,6 +780,32 @@ def analyze_table_fields(cursor, table_name: str, sample_size: int = 1000) -> Di
     }
 
 
+def analyze_tables(cursor, table_names: List[str], sample_size: int = 1000,
+                   conn_factory: Optional[Callable] = None) -> Dict[str, Dict]:
+    """
+    analyze_table_fields for several tables, sharing one analyzer.
+    
+    All schemas are fetched with a single catalog query up front.
+    
+    Returns:
+        {table_name: analyze_table_fields result}
+    """
+    analyzer = IntelligentFieldAnalyzer(cursor, conn_factory=conn_factory)
+    analyzer.prefetch_table_schemas(table_names)
+    
+    results = {}
+    for table_name in table_names:
+        analysis = analyzer.analyze_table(table_name, sample_size)
+        if 'error' in analysis:
+            results[table_name] = analysis
+        else:
+            results[table_name] = {
+                'analysis': analysis,
+                'weights': analyzer.generate_weight_config(analysis)
+            }
+    return results
+
+
 if __name__ == "__main__":
     # Example usage
     import os
@@ -477,17 +813,23 @@ if __name__ == "__main__":
     
     load_dotenv()
     
-    conn = psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST", "localhost"),
-        port=int(os.getenv("POSTGRES_PORT", "5433")),
-        database=os.getenv("POSTGRES_DATABASE", "ai_requests_db"),
-        user=os.getenv("POSTGRES_USER", "postgres"),
-        password=os.getenv("POSTGRES_PASSWORD")
-    )
+    def connect():
+        conn = psycopg2.connect(
+            host=os.getenv("POSTGRES_HOST", "localhost"),
+            port=int(os.getenv("POSTGRES_PORT", "5433")),
+            database=os.getenv("POSTGRES_DATABASE", "ai_requests_db"),
+            user=os.getenv("POSTGRES_USER", "postgres"),
+            password=os.getenv("POSTGRES_PASSWORD")
+        )
+        # The analysis only reads. Not autocommit: sampling relies on
+        # savepoints and a server-side cursor, which need a transaction
+        conn.set_session(readonly=True)
+        return conn
     
+    conn = connect()
     cursor = conn.cursor()
     
-    result = analyze_table_fields(cursor, "requests", sample_size=1000)
+    result = analyze_table_fields(cursor, "requests", sample_size=1000, conn_factory=connect)
     
     print("=" * 80)
     print("IMPROVED INTELLIGENT FIELD ANALYSIS")
@@ -10,6 +10,11 @@ import time
 import psycopg2
 from getpass import getpass
 
+# Schema bootstrap run once the container accepts connections
+BOOTSTRAP_SQL = """
+CREATE EXTENSION IF NOT EXISTS vector;
+"""
+
 def check_docker():
     """Check if Docker is installed."""
     try:
@@ -22,6 +27,28 @@ def check_docker():
     except FileNotFoundError:
         return False
 
+def wait_for_pg(timeout=60, database="ai_requests_db"):
+    """
+    Poll the container until PostgreSQL accepts connections.
+    
+    Checks over TCP: during first-start initialization the image runs a
+    temporary server on the Unix socket only, which must not count as ready.
+    Returns False if it isn't ready within timeout seconds. Also used by
+    setup_pgvector.py.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while time.monotonic() < deadline:
+        result = subprocess.run([
+            "docker", "exec", "rag_postgres",
+            "pg_isready", "-h", "127.0.0.1", "-U", "postgres", "-d", database
+        ], capture_output=True)
+        if result.returncode == 0:
+            return True
+        time.sleep(delay)
+        delay = min(delay * 1.5, 3.0)
+    return False
+
 def install_docker_guide():
     """Guide user to install Docker."""
     print()
@@ -69,6 +96,8 @@ def setup_docker_postgres():
             if "rag_postgres" not in result.stdout:
                 print("Starting container...")
                 subprocess.run(["docker", "start", "rag_postgres"], check=True)
+                if not wait_for_pg():
+                    print("⚠️  PostgreSQL is not accepting connections yet")
             print("✅ Container is running!")
             return True
     
@@ -90,34 +119,29 @@ def setup_docker_postgres():
         
         print("✅ Container created!")
         print()
-        print("Waiting for PostgreSQL to start (30 seconds)...")
-        time.sleep(30)
-        
-        # Verify it's running
-        result = subprocess.run(["docker", "ps", "--filter", "name=rag_postgres", "--format", "{{.Names}}"],
-                              capture_output=True, text=True)
-        if "rag_postgres" not in result.stdout:
-            print("⚠️  Container not running, trying to start...")
-            subprocess.run(["docker", "start", "rag_postgres"], check=True)
-            time.sleep(10)
+        print("Waiting for PostgreSQL to start...")
+        if not wait_for_pg():
+            # Verify it's running
+            result = subprocess.run(["docker", "ps", "--filter", "name=rag_postgres", "--format", "{{.Names}}"],
+                                  capture_output=True, text=True)
+            if "rag_postgres" not in result.stdout:
+                print("⚠️  Container not running, trying to start...")
+                subprocess.run(["docker", "start", "rag_postgres"], check=True)
+            if not wait_for_pg():
+                print("⚠️  PostgreSQL did not become ready in time")
         
-        # Enable extension
+        # Enable extension (and any other bootstrap DDL) in one psql session
+        # fed over stdin; the statements are idempotent, so re-runs are safe
         print("Enabling pgvector extension...")
         result = subprocess.run([
             "docker", "exec", "-i", "rag_postgres",
-            "psql", "-U", "postgres", "-d", "ai_requests_db", "-c", "CREATE EXTENSION IF NOT EXISTS vector;"
-        ], capture_output=True, text=True)
+            "psql", "-U", "postgres", "-d", "ai_requests_db", "-v", "ON_ERROR_STOP=1", "-f", "-"
+        ], input=BOOTSTRAP_SQL, capture_output=True, text=True)
         
         if result.returncode == 0:
             print("✅ pgvector extension enabled!")
         else:
             print(f"⚠️  Extension enable had issues: {result.stderr}")
-            # Try again
-            time.sleep(5)
-            subprocess.run([
-                "docker", "exec", "-i", "rag_postgres",
-                "psql", "-U", "postgres", "-d", "ai_requests_db", "-c", "CREATE EXTENSION vector;"
-            ], check=False)
         
         print()
         print("=" * 80)
@@ -2,19 +2,41 @@
 Interactive setup wizard for embedding generation.
 
 This creates a configuration file that can be used by the universal embedding generator.
+
+Run with --config answers.json to skip the prompts: each prompt's answer
+is read from the JSON file (keys: host, port, database, user, password,
+import_csv, csv_path, table, primary_key, chunk_size, overlap, model,
+dimension). Missing keys take the prompt's default.
 """
+import argparse
 import os
 import json
 from pathlib import Path
 import sys
 
+# Optional: faster JSON serialization for the config file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.setup.auto_detect_schema import detect_schema, get_database_connection, detect_table_schema
+from scripts.setup._db import ask, atomic_write
+from scripts.setup.auto_detect_schema import cached_table_schemas, detect_table_schema
 from scripts.setup.intelligent_field_analysis import analyze_table_fields
 
+# Rows sampled per column by the field analysis; wide tables get a smaller
+# sample since every column is sampled separately
+ANALYSIS_SAMPLE_SIZE = 1000
+WIDE_TABLE_COLUMNS = 100
+WIDE_TABLE_SAMPLE_SIZE = 500
+
+# Column name -> display label: underscores become spaces
+_UNDERSCORE_TO_SPACE = str.maketrans('_', ' ')
+
 
 def print_header(title: str):
     """Print a formatted header."""
@@ -25,8 +47,8 @@ def print_header(title: str):
     print()
 
 
-def get_database_connection_interactive():
-    """Get database connection interactively or from .env."""
+def get_database_connection_interactive(answers=None):
+    """Get database connection interactively (or from the answers file) or from .env."""
     print_header("DATABASE CONNECTION")
     
     # Try .env first
@@ -46,7 +68,9 @@ def get_database_connection_interactive():
         print(f"  User: {user}")
         print()
         
-        use_env = input("Use this configuration? (yes/no) [yes]: ").strip().lower()
+        # An answers file with its own database overrides .env
+        use_env_default = 'no' if answers and answers.get('database') else 'yes'
+        use_env = ask(answers, 'use_env', "Use this configuration? (yes/no) [yes]: ", use_env_default).lower()
         if use_env != 'no':
             return {
                 'host': host,
@@ -58,11 +82,11 @@ def get_database_connection_interactive():
     
     # Interactive input
     print("Enter database connection details:")
-    host = input("Host [localhost]: ").strip() or "localhost"
-    port = input("Port [5433]: ").strip() or "5433"
-    database = input("Database: ").strip()
-    user = input("User [postgres]: ").strip() or "postgres"
-    password = input("Password: ").strip()
+    host = ask(answers, 'host', "Host [localhost]: ", "localhost")
+    port = ask(answers, 'port', "Port [5433]: ", "5433")
+    database = ask(answers, 'database', "Database: ")
+    user = ask(answers, 'user', "User [postgres]: ", "postgres")
+    password = ask(answers, 'password', "Password: ")
     
     if not database or not password:
         print("❌ Error: Database and password are required!")
@@ -77,7 +101,7 @@ def get_database_connection_interactive():
     }
 
 
-def import_csv_option(connection_params: dict):
+def import_csv_option(connection_params: dict, answers=None):
     """Option to import CSV file first."""
     print_header("CSV IMPORT OPTION")
     
@@ -85,18 +109,18 @@ def import_csv_option(connection_params: dict):
     print("(Useful if your data is in SQL Server, MySQL, or another database)")
     print()
     
-    choice = input("Import CSV file? (yes/no) [no]: ").strip().lower()
+    choice = ask(answers, 'import_csv', "Import CSV file? (yes/no) [no]: ", "no").lower()
     
     if choice not in ['yes', 'y']:
         return None
     
-    csv_path = input("Enter CSV file path: ").strip()
+    csv_path = ask(answers, 'csv_path', "Enter CSV file path: ")
     
     if not csv_path or not Path(csv_path).exists():
         print(f"❌ CSV file not found: {csv_path}")
         return None
     
-    table_name = input("Enter table name for imported data: ").strip()
+    table_name = ask(answers, 'table', "Enter table name for imported data: ")
     
     if not table_name:
         print("❌ Table name is required!")
@@ -124,24 +148,34 @@ def import_csv_option(connection_params: dict):
     return result['table_name']
 
 
-def select_table(connection_params: dict):
-    """Let user select a table from the database or import CSV."""
+def select_table(connection_params: dict, cursor, answers=None, use_cache: bool = True):
+    """
+    Let user select a table from the database or import CSV.
+    
+    Tables are detected on the wizard's open cursor (no second connection),
+    reusing the on-disk schema cache while the catalog is unchanged.
+    
+    Returns:
+        (table_name, schema) - schema is the one detected for the whole
+        database, or None for a freshly imported CSV; (None, None) if cancelled
+    """
     print_header("TABLE SELECTION")
     
     # Option 1: Import CSV
-    imported_table = import_csv_option(connection_params)
+    imported_table = import_csv_option(connection_params, answers)
     if imported_table:
-        return imported_table
+        return imported_table, None
     
     # Option 2: Select existing table
     print("Detecting tables in database...")
-    result = detect_schema(connection_params)
-    
-    if 'error' in result:
-        print(f"❌ Error: {result['error']}")
-        return None
+    try:
+        schemas = cached_table_schemas(cursor, use_cache)
+    except Exception as e:
+        cursor.connection.rollback()
+        print(f"❌ Error: {e}")
+        return None, None
     
-    tables = result['tables']
+    tables = list(schemas)
     
     if not tables:
         print("❌ No tables found in database!")
@@ -149,15 +183,15 @@ def select_table(connection_params: dict):
         print("Options:")
         print("  1. Import CSV file (run setup wizard again)")
         print("  2. Create table manually in PostgreSQL")
-        return None
+        return None, None
     
     print(f"Found {len(tables)} tables:")
     print()
     
     for i, table in enumerate(tables, 1):
-        schema = result['schemas'][table]
+        schema = schemas[table]
         print(f"{i}. {table}")
-        print(f"   Rows: {schema['row_count']:,}")
+        print(f"   Rows: ~{schema['row_count']:,}")
         print(f"   Columns: {len(schema['columns'])}")
         print(f"   Primary Key (suggested): {schema['primary_key']}")
         print()
@@ -167,53 +201,62 @@ def select_table(connection_params: dict):
     
     while True:
         try:
-            choice = input(f"Select table (1-{len(tables)}) or enter table name: ").strip()
+            choice = ask(answers, 'table', f"Select table (1-{len(tables)}) or enter table name: ")
             
-            if choice.lower() == 'csv':
+            if choice.lower() == 'csv' and answers is None:
                 imported_table = import_csv_option(connection_params)
                 if imported_table:
-                    return imported_table
+                    return imported_table, None
                 continue
             
             # Try as number
             if choice.isdigit():
                 idx = int(choice) - 1
                 if 0 <= idx < len(tables):
-                    return tables[idx]
+                    return tables[idx], schemas[tables[idx]]
                 else:
                     print(f"❌ Invalid number. Please enter 1-{len(tables)}")
             # Try as table name
-            elif choice in tables:
-                return choice
+            elif choice in schemas:
+                return choice, schemas[choice]
             else:
                 print(f"❌ Table '{choice}' not found. Please try again.")
+            
+            # An answers file can't be asked again
+            if answers is not None:
+                return None, None
         except KeyboardInterrupt:
             print("\nCancelled.")
-            return None
+            return None, None
 
 
-def confirm_primary_key(schema: dict):
+def confirm_primary_key(schema: dict, answers=None):
     """Confirm or change primary key suggestion."""
     print_header("PRIMARY KEY")
     
     suggested = schema['primary_key']
+    columns = schema['columns']
+    column_names = frozenset(col['name'] for col in columns)
     print(f"Suggested primary key: {suggested}")
     print()
     
     # Show all columns
     print("Available columns:")
-    for i, col in enumerate(schema['columns'][:20], 1):  # Show first 20
+    for col in columns[:20]:  # Show first 20
         marker = " ← suggested" if col['name'] == suggested else ""
         print(f"  {col['name']} ({col['type']}){marker}")
-    if len(schema['columns']) > 20:
-        print(f"  ... and {len(schema['columns']) - 20} more")
+    if len(columns) > 20:
+        print(f"  ... and {len(columns) - 20} more")
     print()
     
-    choice = input(f"Use '{suggested}' as primary key? (yes/no) [yes]: ").strip().lower()
+    # An answers file changes the key by naming one
+    choice_default = 'no' if answers and answers.get('primary_key') else 'yes'
+    choice = ask(answers, 'use_suggested_primary_key',
+                 f"Use '{suggested}' as primary key? (yes/no) [yes]: ", choice_default).lower()
     
     if choice == 'no':
-        new_key = input("Enter primary key column name: ").strip()
-        if new_key in [col['name'] for col in schema['columns']]:
+        new_key = ask(answers, 'primary_key', "Enter primary key column name: ")
+        if new_key in column_names:
             return new_key
         else:
             print(f"⚠️  '{new_key}' not found in columns. Using suggested '{suggested}'")
@@ -222,15 +265,41 @@ def confirm_primary_key(schema: dict):
     return suggested
 
 
-def run_intelligent_analysis(cursor, table_name: str):
-    """Run intelligent field analysis and get weight suggestions."""
+def connect(connection_params: dict, readonly: bool = False):
+    """
+    Open a connection with the wizard's connection settings.
+    
+    The wizard's own connection and the analysis workers both come from
+    here, so they always read the same database.
+    """
+    import psycopg2
+    
+    conn = psycopg2.connect(**connection_params)
+    if readonly:
+        conn.set_session(readonly=True)
+    return conn
+
+
+def run_intelligent_analysis(cursor, table_name: str, column_count: int = 0, connection_params: dict = None):
+    """
+    Run intelligent field analysis and get weight suggestions.
+    
+    With connection_params (the ones cursor's connection was opened with),
+    columns are analyzed in parallel on extra read-only connections.
+    """
     print_header("INTELLIGENT FIELD ANALYSIS")
     
     print("Analyzing table structure and data...")
     print("This may take a minute...")
     print()
     
-    result = analyze_table_fields(cursor, table_name, sample_size=1000)
+    conn_factory = None
+    if connection_params:
+        def conn_factory():
+            return connect(connection_params, readonly=True)
+    
+    sample_size = WIDE_TABLE_SAMPLE_SIZE if column_count > WIDE_TABLE_COLUMNS else ANALYSIS_SAMPLE_SIZE
+    result = analyze_table_fields(cursor, table_name, sample_size=sample_size, conn_factory=conn_factory)
     
     if 'error' in result:
         print(f"❌ Error: {result['error']}")
@@ -288,7 +357,7 @@ def generate_config(connection_params: dict, table_name: str, primary_key: str,
                 "1.0x": weights.get('1.0x', [])
             },
             "labels": {
-                col['name']: col['name'].replace('_', ' ').title()
+                col['name']: col['name'].translate(_UNDERSCORE_TO_SPACE).title()
                 for col in schema['columns']
             }
         },
@@ -306,44 +375,53 @@ def generate_config(connection_params: dict, table_name: str, primary_key: str,
 
 def main():
     """Main setup wizard."""
+    parser = argparse.ArgumentParser(description="Set up embedding generation for a table.")
+    parser.add_argument('--config', help="JSON file with the wizard's answers (runs without prompts)")
+    parser.add_argument('--no-cache', action='store_true', help="Detect tables again instead of using the schema cache")
+    args = parser.parse_args()
+    
+    answers = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            answers = json.load(f)
+    
     print_header("EMBEDDING SETUP WIZARD")
     print("This wizard will help you set up embedding generation for any table.")
     print()
     
     # Step 1: Database connection
-    connection_params = get_database_connection_interactive()
+    connection_params = get_database_connection_interactive(answers)
     if not connection_params:
         print("❌ Setup cancelled.")
         return 1
     
-    # Step 2: Connect and select table
-    conn = get_database_connection()
-    if not conn:
-        # Try with provided params
-        import psycopg2
-        try:
-            conn = psycopg2.connect(**connection_params)
-        except Exception as e:
-            print(f"❌ Error connecting to database: {e}")
-            return 1
+    # Step 2: Connect and select table (with the settings resolved above,
+    # so an answers file's database isn't replaced by the one in .env)
+    try:
+        conn = connect(connection_params)
+    except Exception as e:
+        print(f"❌ Error connecting to database: {e}")
+        return 1
     
     cursor = conn.cursor()
     
     try:
         # Step 3: Select table
-        table_name = select_table(connection_params)
+        table_name, schema = select_table(connection_params, cursor, answers, use_cache=not args.no_cache)
         if not table_name:
             print("❌ Setup cancelled.")
             return 1
         
-        # Get schema for selected table
-        schema = detect_table_schema(cursor, table_name)
+        # Schema was detected with the table list; only a newly imported
+        # table needs its own lookup
+        if schema is None:
+            schema = detect_table_schema(cursor, table_name)
         
         # Step 4: Confirm primary key
-        primary_key = confirm_primary_key(schema)
+        primary_key = confirm_primary_key(schema, answers)
         
         # Step 5: Run intelligent analysis
-        weights = run_intelligent_analysis(cursor, table_name)
+        weights = run_intelligent_analysis(cursor, table_name, len(schema['columns']), connection_params)
         if not weights:
             print("⚠️  Could not run intelligent analysis. Using defaults.")
             weights = {
@@ -355,8 +433,8 @@ def main():
         
         # Step 6: Chunking parameters
         print_header("CHUNKING PARAMETERS")
-        chunk_size = input("Chunk size [512]: ").strip() or "512"
-        overlap = input("Overlap [50]: ").strip() or "50"
+        chunk_size = ask(answers, 'chunk_size', "Chunk size [512]: ", "512")
+        overlap = ask(answers, 'overlap', "Overlap [50]: ", "50")
         chunking = {
             "max_chunk_size": int(chunk_size),
             "overlap": int(overlap)
@@ -370,7 +448,8 @@ def main():
         print("  3. Custom (enter model name)")
         print()
         
-        model_choice = input("Select model [1]: ").strip() or "1"
+        # In an answers file, 'model' is 1, 2, or a model name
+        model_choice = ask(answers, 'model', "Select model [1]: ", "1")
         
         if model_choice == "1":
             model = "sentence-transformers/all-MiniLM-L6-v2"
@@ -379,8 +458,8 @@ def main():
             model = "sentence-transformers/all-mpnet-base-v2"
             dimension = 768
         else:
-            model = input("Enter model name: ").strip()
-            dimension_input = input("Enter dimension: ").strip()
+            model = ask(answers, 'model', "Enter model name: ")
+            dimension_input = ask(answers, 'dimension', "Enter dimension: ")
             dimension = int(dimension_input) if dimension_input.isdigit() else 384
         
         embedding = {
@@ -409,8 +488,11 @@ def main():
         config_file = config_dir / "embedding_config.json"
         
         print(f"Saving configuration to: {config_file}")
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            config_json = orjson.dumps(config, option=orjson.OPT_INDENT_2).decode('utf-8')
+        else:
+            config_json = json.dumps(config, indent=2, ensure_ascii=False)
+        atomic_write(config_file, config_json)
         
         print()
         print("=" * 80)
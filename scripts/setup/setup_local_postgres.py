@@ -7,29 +7,101 @@ This script helps you:
 3. Enable pgvector extension
 4. Set up local-only configuration
 5. Create .env file with credentials
+
+Run with --config answers.json to skip the prompts: each prompt's answer
+is read from the JSON file (keys: host, port, user, password, database,
+use_existing_database, continue_without_pgvector, overwrite_env).
+Missing keys take the prompt's default.
 """
+import argparse
+import atexit
+import json
+import mmap
 import os
+import re
+import socket
 import sys
 import psycopg2
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from getpass import getpass
 
-def test_connection(host, port, database, user, password):
-    """Test PostgreSQL connection."""
-    try:
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.setup._db import ask, atomic_write
+
+# Credential prompts before giving up on the connection test
+LOGIN_ATTEMPTS = 3
+
+# Active (uncommented) listen_addresses setting in postgresql.conf
+LISTEN_ADDRESSES_RE = re.compile(rb"^[ \t]*listen_addresses[ \t]*=[ \t]*'([^']*)'", re.MULTILINE)
+
+# Open connections by (host, port, database, user, password), shared by the
+# setup steps so each database is only connected to once per run
+_connections = {}
+
+def _get_conn(host, port, database, user, password, connect_timeout=None, options=None):
+    """
+    Get an autocommit connection, reusing an open one for the same parameters.
+    
+    connect_timeout and options only apply when a new connection is opened.
+    """
+    key = (host, port, database, user, password)
+    conn = _connections.get(key)
+    if conn is None or conn.closed:
         conn = psycopg2.connect(
             host=host,
             port=port,
             database=database,
             user=user,
-            password=password
+            password=password,
+            connect_timeout=connect_timeout,
+            options=options
         )
+        conn.autocommit = True
+        _connections[key] = conn
+    return conn
+
+# (host, port, database) where pgvector is known to be enabled this run
+_pgvector_ready = set()
+
+@atexit.register
+def _close_connections():
+    """Close all cached connections."""
+    for conn in _connections.values():
         conn.close()
+    _connections.clear()
+
+def test_connection(host, port, database, user, password):
+    """Test PostgreSQL connection (kept open for the following steps)."""
+    try:
+        # Fail fast on a wrong host/port instead of the OS connect timeout, and
+        # on a server that accepts the connection but then stalls
+        conn = _get_conn(host, port, database, user, password, connect_timeout=2,
+                         options='-c statement_timeout=2000')
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1;")
+            # The next steps reuse this connection for slow DDL (CREATE DATABASE)
+            cursor.execute("SET statement_timeout = 0;")
         return True
     except Exception as e:
+        # Don't hand a stalled connection to the next attempt
+        conn = _connections.pop((host, port, database, user, password), None)
+        if conn is not None:
+            conn.close()
         print(f"   ❌ Connection failed: {e}")
         return False
 
+def _port_open(host, port, timeout=0.2):
+    """Cheap TCP check that something is listening, before paying for a login."""
+    try:
+        socket.create_connection((host, port), timeout).close()
+        return True
+    except OSError:
+        return False
+
 def check_postgres_servers():
     """Check what PostgreSQL servers are running."""
     print("=" * 80)
@@ -40,36 +112,33 @@ def check_postgres_servers():
     # Common PostgreSQL ports
     common_ports = [5432, 5433, 5434]
     
-    found_servers = []
-    for port in common_ports:
+    def probe(port):
+        if not _port_open("localhost", port):
+            return False
         try:
-            conn = psycopg2.connect(
-                host="localhost",
-                port=port,
-                database="postgres",
-                user="postgres",
-                password="postgres"  # Try default
-            )
-            conn.close()
+            # Try default credentials; give up on a silent port after 1 second
+            _get_conn("localhost", port, "postgres", "postgres", "postgres", connect_timeout=1)
+            return True
+        except (psycopg2.Error, OSError):
+            return False
+    
+    # Probe all ports at once instead of waiting on each in turn
+    with ThreadPoolExecutor(max_workers=len(common_ports)) as executor:
+        reachable = list(executor.map(probe, common_ports))
+    
+    found_servers = []
+    for port, ok in zip(common_ports, reachable):
+        if ok:
             found_servers.append(("localhost", port, "postgres", "postgres"))
             print(f"   ✓ Found server on port {port} (default credentials work)")
-        except:
-            pass
     
     return found_servers
 
-def create_database(host, port, user, password, db_name):
+def create_database(host, port, user, password, db_name, answers=None):
     """Create a new database."""
     try:
         # Connect to default 'postgres' database
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            database="postgres",
-            user=user,
-            password=password
-        )
-        conn.autocommit = True
+        conn = _get_conn(host, port, "postgres", user, password)
         cursor = conn.cursor()
         
         # Check if database exists
@@ -78,11 +147,10 @@ def create_database(host, port, user, password, db_name):
         
         if exists:
             print(f"   ⚠️  Database '{db_name}' already exists")
-            response = input(f"   Use existing database '{db_name}'? (y/n): ").strip().lower()
+            response = ask(answers, 'use_existing_database', f"   Use existing database '{db_name}'? (y/n): ").lower()
             if response != 'y':
                 print("   Cancelled.")
                 cursor.close()
-                conn.close()
                 return False
         else:
             # Create database
@@ -90,7 +158,6 @@ def create_database(host, port, user, password, db_name):
             print(f"   ✅ Created database '{db_name}'")
         
         cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -98,31 +165,24 @@ def create_database(host, port, user, password, db_name):
         return False
 
 def enable_pgvector(host, port, user, password, db_name):
-    """Enable pgvector extension."""
+    """Enable pgvector extension (a no-op once done for a database this run)."""
+    key = (host, port, db_name)
+    if key in _pgvector_ready:
+        return True
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            database=db_name,
-            user=user,
-            password=password
-        )
-        conn.autocommit = True
+        conn = _get_conn(host, port, db_name, user, password)
         cursor = conn.cursor()
         
-        # Check if extension exists
-        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'vector';")
-        exists = cursor.fetchone()
-        
-        if exists:
-            print("   ✓ pgvector extension already enabled")
-        else:
-            # Enable extension
-            cursor.execute("CREATE EXTENSION vector;")
-            print("   ✅ Enabled pgvector extension")
+        # Enable (idempotent) and read back the version in one round trip
+        cursor.execute("""
+            CREATE EXTENSION IF NOT EXISTS vector;
+            SELECT extversion FROM pg_extension WHERE extname = 'vector';
+        """)
+        version = cursor.fetchone()[0]
+        print(f"   ✅ pgvector extension enabled (version {version})")
+        _pgvector_ready.add(key)
         
         cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -132,6 +192,23 @@ def enable_pgvector(host, port, user, password, db_name):
         print("   - Or use Docker: docker run -d -p 5433:5432 pgvector/pgvector:pg16")
         return False
 
+def read_listen_addresses(conf_path):
+    """
+    Get the active listen_addresses value from postgresql.conf, or None.
+    
+    The regex scans a read-only memory map of the file (no copy into a
+    Python string). Commented-out lines don't count, and the last setting
+    wins, as in PostgreSQL.
+    """
+    with open(conf_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            value = None
+            for match in LISTEN_ADDRESSES_RE.finditer(mm):
+                value = match.group(1)
+    return value.decode('utf-8', errors='replace').strip() if value is not None else None
+
 def check_local_only(host, port):
     """Check if PostgreSQL is configured for local-only access."""
     print()
@@ -151,17 +228,16 @@ def check_local_only(host, port):
         if conf_path.exists():
             print(f"   Found config: {conf_path}")
             try:
-                with open(conf_path, 'r') as f:
-                    content = f.read()
-                    if "listen_addresses = 'localhost'" in content or "listen_addresses = '127.0.0.1'" in content:
-                        print("   ✅ Configured for local-only (localhost)")
-                    elif "listen_addresses = '*'" in content:
-                        print("   ⚠️  Configured to listen on all addresses (not local-only)")
-                        print("   💡 To make local-only, edit postgresql.conf:")
-                        print("      Change: listen_addresses = '*'")
-                        print("      To: listen_addresses = 'localhost'")
-                    else:
-                        print("   ℹ️  Using default (usually local-only)")
+                listen_addresses = read_listen_addresses(conf_path)
+                if listen_addresses in ('localhost', '127.0.0.1'):
+                    print("   ✅ Configured for local-only (localhost)")
+                elif listen_addresses == '*':
+                    print("   ⚠️  Configured to listen on all addresses (not local-only)")
+                    print("   💡 To make local-only, edit postgresql.conf:")
+                    print("      Change: listen_addresses = '*'")
+                    print("      To: listen_addresses = 'localhost'")
+                else:
+                    print("   ℹ️  Using default (usually local-only)")
             except Exception as e:
                 print(f"   ⚠️  Could not read config: {e}")
             break
@@ -174,13 +250,13 @@ def check_local_only(host, port):
     print("   ✅ External projects won't be affected")
     print("   ✅ Each database is separate and isolated")
 
-def create_env_file(host, port, database, user, password):
+def create_env_file(host, port, database, user, password, answers=None):
     """Create .env file with database credentials."""
     env_path = Path(".env")
     
     if env_path.exists():
         print()
-        response = input("   .env file already exists. Overwrite? (y/n): ").strip().lower()
+        response = ask(answers, 'overwrite_env', "   .env file already exists. Overwrite? (y/n): ").lower()
         if response != 'y':
             print("   Skipped creating .env file")
             return False
@@ -195,8 +271,7 @@ POSTGRES_PASSWORD={password}
 """
     
     try:
-        with open(env_path, 'w') as f:
-            f.write(env_content)
+        atomic_write(env_path, env_content)
         print(f"   ✅ Created .env file at {env_path.absolute()}")
         print("   ⚠️  Keep this file secure - it contains your password!")
         return True
@@ -206,6 +281,15 @@ POSTGRES_PASSWORD={password}
 
 def main():
     """Main setup function."""
+    parser = argparse.ArgumentParser(description="Set up a local PostgreSQL database for the RAG project.")
+    parser.add_argument('--config', help="JSON file with the setup answers (runs without prompts)")
+    args = parser.parse_args()
+    
+    answers = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            answers = json.load(f)
+    
     print("=" * 80)
     print("POSTGRESQL SETUP FOR RAG PROJECT")
     print("=" * 80)
@@ -224,8 +308,8 @@ def main():
     print("(Press Enter to use defaults)")
     print()
     
-    host = input("Host [localhost]: ").strip() or "localhost"
-    port_input = input("Port [5432]: ").strip()
+    host = ask(answers, 'host', "Host [localhost]: ", "localhost")
+    port_input = ask(answers, 'port', "Port [5432]: ")
     port = int(port_input) if port_input else 5432
     
     # Try to find existing servers
@@ -237,14 +321,22 @@ def main():
         print()
         print("Found PostgreSQL servers. You can use one of these or enter different credentials.")
     
-    print()
-    user = input("Username [postgres]: ").strip() or "postgres"
-    password = getpass("Password: ")
-    
-    # Test connection
-    print()
-    print("Testing connection to 'postgres' database...")
-    if not test_connection(host, port, "postgres", user, password):
+    # Ask for credentials again on failure (the server probe above isn't
+    # repeated); an answers file gets a single attempt
+    attempts = 1 if answers is not None else LOGIN_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        print()
+        user = ask(answers, 'user', "Username [postgres]: ", "postgres")
+        password = getpass("Password: ") if answers is None else str(answers.get('password', ''))
+        
+        # Test connection (kept open and reused by the next steps)
+        print()
+        print("Testing connection to 'postgres' database...")
+        if test_connection(host, port, "postgres", user, password):
+            break
+        if attempt < attempts:
+            print(f"   Please try again ({attempts - attempt} attempt(s) left)")
+    else:
         print()
         print("❌ Connection failed!")
         print()
@@ -268,9 +360,9 @@ def main():
     print("=" * 80)
     print()
     
-    db_name = input("Database name [ai_requests_db]: ").strip() or "ai_requests_db"
+    db_name = ask(answers, 'database', "Database name [ai_requests_db]: ", "ai_requests_db")
     
-    if not create_database(host, port, user, password, db_name):
+    if not create_database(host, port, user, password, db_name, answers):
         return 1
     
     # Step 3: Enable pgvector
@@ -287,7 +379,7 @@ def main():
         print("   1. Install pgvector manually")
         print("   2. Use Docker: docker run -d -p 5433:5432 pgvector/pgvector:pg16")
         print("   3. Continue without pgvector (embeddings won't work)")
-        response = input("   Continue anyway? (y/n): ").strip().lower()
+        response = ask(answers, 'continue_without_pgvector', "   Continue anyway? (y/n): ").lower()
         if response != 'y':
             return 1
     
@@ -301,7 +393,7 @@ def main():
     print("=" * 80)
     print()
     
-    create_env_file(host, port, db_name, user, password)
+    create_env_file(host, port, db_name, user, password, answers)
     
     # Summary
     print()
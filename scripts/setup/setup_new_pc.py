@@ -3,6 +3,7 @@ Setup script for new PC.
 
 Checks prerequisites, verifies database, checks models, and provides setup instructions.
 """
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -34,10 +35,10 @@ def check_packages():
     
     all_ok = True
     for module, package in packages.items():
-        try:
-            __import__(module)
+        # find_spec only locates the package; importing torch etc. takes seconds
+        if importlib.util.find_spec(module) is not None:
             print(f"   ✓ {package}")
-        except ImportError:
+        else:
             print(f"   ❌ {package} - Install: pip install {package}")
             all_ok = False
     
@@ -69,37 +70,39 @@ def check_database():
             user=user,
             password=password
         )
-        cursor = conn.cursor()
-        
-        # Check pgvector
-        cursor.execute("SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'vector');")
-        has_pgvector = cursor.fetchone()[0]
-        
-        # Check tables
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name IN ('requests', 'request_embeddings')
-        """)
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        cursor.close()
-        conn.close()
+        # with-block closes the cursor; the connection is closed exactly once
+        try:
+            with conn.cursor() as cursor:
+                # Check pgvector, tables and embeddings row estimate in one round-trip
+                # (reltuples is NULL when request_embeddings doesn't exist)
+                cursor.execute("""
+                    SELECT
+                        EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'vector'),
+                        ARRAY(
+                            SELECT table_name::text
+                            FROM information_schema.tables 
+                            WHERE table_schema = 'public' 
+                            AND table_name IN ('requests', 'request_embeddings')
+                            ORDER BY table_name
+                        ),
+                        (SELECT reltuples::bigint FROM pg_class
+                         WHERE oid = to_regclass('public.request_embeddings'))
+                """)
+                has_pgvector, tables, count = cursor.fetchone()
+                
+                # Exact count only if the table was never analyzed (reltuples = -1)
+                if count is not None and count < 0:
+                    cursor.execute("SELECT COUNT(*) FROM request_embeddings;")
+                    count = cursor.fetchone()[0]
+        finally:
+            conn.close()
         
         print(f"   ✓ Database connection successful")
         print(f"   ✓ pgvector extension: {'installed' if has_pgvector else 'NOT installed'}")
         print(f"   ✓ Tables found: {', '.join(tables) if tables else 'None'}")
         
-        if 'request_embeddings' in tables:
-            cursor2 = conn.cursor()
-            cursor2.execute("SELECT COUNT(*) FROM request_embeddings;")
-            count = cursor2.fetchone()[0]
-            cursor2.close()
-            print(f"   ✓ Embeddings: {count:,} rows")
-        
-        cursor.close()
-        conn.close()
+        if count is not None:
+            print(f"   ✓ Embeddings: ~{count:,} rows")
         
         return True
         
@@ -114,10 +117,14 @@ def check_models():
     # Check LLM model
     llm_path = Path("models/llm/mistral-7b-instruct")
     if llm_path.exists():
-        # Check if model files exist
-        model_files = list(llm_path.glob("*.safetensors")) + list(llm_path.glob("*.bin"))
-        if model_files:
-            total_size = sum(f.stat().st_size for f in model_files)
+        # Check if model files exist (one directory read for both suffixes)
+        with os.scandir(llm_path) as it:
+            model_sizes = [
+                entry.stat().st_size for entry in it
+                if entry.is_file() and entry.name.endswith(('.safetensors', '.bin'))
+            ]
+        if model_sizes:
+            total_size = sum(model_sizes)
             size_gb = total_size / (1024**3)
             print(f"   ✓ LLM model found: {size_gb:.2f} GB")
             return True
@@ -130,6 +137,17 @@ def check_models():
         print("      Model will download on first RAG query (~30-60 minutes)")
         return False
 
+def _scandir_recursive(path):
+    """Yield DirEntry objects under path, depth-first, without following symlinks."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+    except (PermissionError, FileNotFoundError):
+        pass
+
 def check_embedding_model():
     """Check embedding model cache."""
     print("\n5. Checking embedding model...")
@@ -141,15 +159,14 @@ def check_embedding_model():
     ]
     
     model_name = "sentence-transformers_all-MiniLM-L6-v2"
-    found = False
     
-    for cache_path in cache_paths:
-        if cache_path.exists():
-            # Look for model
-            for item in cache_path.rglob("*"):
-                if model_name in str(item) or "MiniLM" in str(item):
-                    found = True
-                    break
+    # Stop at the first entry whose name matches (a match anywhere in a path
+    # is a match on one of its components, so names are enough)
+    found = any(
+        model_name in entry.name or "MiniLM" in entry.name
+        for cache_path in cache_paths
+        for entry in _scandir_recursive(cache_path)
+    )
     
     if found:
         print("   ✓ Embedding model found in cache")
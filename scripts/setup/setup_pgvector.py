@@ -10,12 +10,30 @@ This script will:
 import os
 import sys
 import subprocess
-import psycopg2
 from pathlib import Path
-from getpass import getpass
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# requests columns searched with ILIKE '%...%' (person and project names)
+TRIGRAM_INDEX_COLUMNS = ('updatedby', 'createdby', 'responsibleemployeename', 'projectname')
+
+# Windows install roots holding one folder per PostgreSQL major version
+POSTGRESQL_ROOTS = ("C:/Program Files/PostgreSQL", "C:/Program Files (x86)/PostgreSQL")
+
+# Run by one psql in the new container: create the database if missing,
+# connect to it, enable pgvector
+DOCKER_BOOTSTRAP_SQL = """
+SELECT 'CREATE DATABASE ai_requests_db' WHERE NOT EXISTS (SELECT 1 FROM pg_database WHERE datname = 'ai_requests_db')\\gexec
+\\c ai_requests_db
+CREATE EXTENSION IF NOT EXISTS vector;
+"""
 
 def test_connection(host, port, database, user, password):
     """Test PostgreSQL connection."""
+    import psycopg2
+    
     try:
         conn = psycopg2.connect(
             host=host,
@@ -32,6 +50,9 @@ def test_connection(host, port, database, user, password):
 
 def check_pgvector_installed(host, port, database, user, password):
     """Check if pgvector extension files exist."""
+    import psycopg2
+    import psycopg2.errors
+    
     try:
         conn = psycopg2.connect(
             host=host,
@@ -48,6 +69,9 @@ def check_pgvector_installed(host, port, database, user, password):
             conn.commit()
             cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector';")
             version = cursor.fetchone()
+            if version:
+                enable_trigram_indexes(cursor)
+                conn.commit()
             cursor.close()
             conn.close()
             
@@ -79,19 +103,22 @@ def check_pgvector_installed(host, port, database, user, password):
         return False
 
 def find_postgresql_path():
-    """Find PostgreSQL installation path."""
-    common_paths = [
-        Path("C:/Program Files/PostgreSQL/16"),
-        Path("C:/Program Files/PostgreSQL/15"),
-        Path("C:/Program Files/PostgreSQL/14"),
-        Path("C:/Program Files/PostgreSQL/13"),
-        Path("C:/Program Files (x86)/PostgreSQL/16"),
-        Path("C:/Program Files (x86)/PostgreSQL/15"),
-    ]
+    """Find PostgreSQL installation path (newest version if several are installed)."""
+    # PGBIN points at <install>/bin
+    pgbin = os.environ.get("PGBIN")
+    if pgbin and os.path.isdir(pgbin):
+        return Path(pgbin).parent
     
-    for path in common_paths:
-        if path.exists():
-            return path
+    # One directory listing per root instead of a stat per hardcoded version
+    roots = [r for r in POSTGRESQL_ROOTS if os.path.isdir(r)]
+    candidates = []
+    for root in roots:
+        with os.scandir(root) as it:
+            candidates.extend(e for e in it if e.is_dir() and e.name.isdigit())
+    
+    if candidates:
+        newest = max(candidates, key=lambda e: int(e.name))
+        return Path(newest.path)
     
     return None
 
@@ -141,6 +168,8 @@ def install_pgvector_guide():
 
 def setup_docker_postgres():
     """Set up Docker PostgreSQL with pgvector."""
+    from scripts.setup.setup_docker_postgres import wait_for_pg
+    
     print()
     print("=" * 80)
     print("DOCKER SETUP (EASIER ALTERNATIVE)")
@@ -202,22 +231,16 @@ def setup_docker_postgres():
         print("   ✅ Docker container created!")
         print()
         print("   Waiting for PostgreSQL to start...")
-        import time
-        time.sleep(5)
+        # The container starts without ai_requests_db; it is created below
+        if not wait_for_pg(database="postgres"):
+            print("   ⚠️  PostgreSQL did not become ready in time")
         
-        # Create database
-        print("   Creating database...")
-        subprocess.run([
-            "docker", "exec", "-i", "rag_postgres",
-            "psql", "-U", "postgres", "-c", "CREATE DATABASE ai_requests_db;"
-        ], check=False, capture_output=True)
-        
-        # Enable extension
-        print("   Enabling pgvector extension...")
+        # Create database and enable extension in one psql session
+        print("   Creating database and enabling pgvector extension...")
         result = subprocess.run([
             "docker", "exec", "-i", "rag_postgres",
-            "psql", "-U", "postgres", "-d", "ai_requests_db", "-c", "CREATE EXTENSION vector;"
-        ], capture_output=True, text=True)
+            "psql", "-U", "postgres", "-v", "ON_ERROR_STOP=1", "-f", "-"
+        ], input=DOCKER_BOOTSTRAP_SQL, capture_output=True, text=True)
         
         if result.returncode == 0:
             print("   ✅ pgvector extension enabled!")
@@ -241,6 +264,8 @@ def setup_docker_postgres():
 
 def enable_pgvector(host, port, database, user, password):
     """Enable pgvector extension."""
+    import psycopg2
+    
     try:
         conn = psycopg2.connect(
             host=host,
@@ -259,6 +284,8 @@ def enable_pgvector(host, port, database, user, password):
         cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector';")
         version = cursor.fetchone()
         
+        enable_trigram_indexes(cursor)
+        
         cursor.close()
         conn.close()
         
@@ -273,6 +300,25 @@ def enable_pgvector(host, port, database, user, password):
         print(f"   ❌ Failed to enable pgvector: {e}")
         return False
 
+def enable_trigram_indexes(cursor):
+    """Add pg_trgm GIN indexes so ILIKE '%name%' lookups on requests can use an index."""
+    try:
+        cursor.execute("SELECT to_regclass('public.requests');")
+        if cursor.fetchone()[0] is None:
+            return  # requests not imported yet; run this script again afterwards
+        
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        for column in TRIGRAM_INDEX_COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_requests_{column}_trgm "
+                f"ON requests USING gin ({column} gin_trgm_ops);"
+            )
+        print("   ✅ Trigram indexes ready on requests")
+    except Exception as e:
+        # No-op under autocommit; otherwise clears the failed transaction
+        cursor.connection.rollback()
+        print(f"   ⚠️  Could not create trigram indexes: {e}")
+
 def create_env_file(host, port, database, user, password):
     """Create .env file."""
     env_path = Path(".env")
@@ -303,6 +349,8 @@ POSTGRES_PASSWORD={password}
 
 def main():
     """Main setup function."""
+    from getpass import getpass
+    
     print("=" * 80)
     print("PGVECTOR SETUP")
     print("=" * 80)
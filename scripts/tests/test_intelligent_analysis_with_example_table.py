@@ -153,10 +153,14 @@ def run_analysis(cursor):
         field_analysis = next((r for r in analysis['results'] if r['column'] == field), None)
         if field_analysis:
             reason = field_analysis.get('name_reason', 'N/A')
-            coverage = field_analysis.get('data_analysis', {}).get('coverage', 0) * 100
-            uniqueness = field_analysis.get('data_analysis', {}).get('uniqueness', 0) * 100
-            avg_length = field_analysis.get('data_analysis', {}).get('avg_length', 0)
-            print(f"  ✓ {field:25s} | Coverage: {coverage:5.1f}% | Uniqueness: {uniqueness:5.1f}% | Avg Length: {avg_length:5.1f}")
+            da = field_analysis.get('data_analysis', {})
+            coverage = da.get('coverage', 0) * 100
+            if da.get('sampled', True):
+                uniqueness = da.get('uniqueness', 0) * 100
+                avg_length = da.get('avg_length', 0)
+                print(f"  ✓ {field:25s} | Coverage: {coverage:5.1f}% | Uniqueness: {uniqueness:5.1f}% | Avg Length: {avg_length:5.1f}")
+            else:  # critical name: not sampled, only coverage is known
+                print(f"  ✓ {field:25s} | Coverage: {coverage:5.1f}% | (not sampled - critical name)")
             print(f"    Reason: {reason}")
     
     print(f"\n🟠 2.0x (Important): {len(weights['2.0x'])} fields")
@@ -204,10 +208,11 @@ def run_analysis(cursor):
                 da = field_result['data_analysis']
                 print(f"   Data Quality:")
                 print(f"     - Coverage: {da['coverage']*100:.1f}%")
-                print(f"     - Uniqueness: {da['uniqueness']*100:.1f}%")
-                print(f"     - Diversity: {da['diversity']*100:.1f}%")
-                print(f"     - Avg Length: {da['avg_length']:.1f} chars")
-                print(f"     - Score: {da['score']:.3f}")
+                if da.get('sampled', True):  # critical-name fields are not sampled
+                    print(f"     - Uniqueness: {da['uniqueness']*100:.1f}%")
+                    print(f"     - Diversity: {da['diversity']*100:.1f}%")
+                    print(f"     - Avg Length: {da['avg_length']:.1f} chars")
+                    print(f"     - Score: {da['score']:.3f}")
 
 
 def main():
@@ -0,0 +1,194 @@
+"""
+Pure-Python checks for the setup and recovery helpers (no database needed).
+
+Covers the precompiled patterns and lookup tables that replaced the
+original per-field `in` tests and if/elif chains, so a change to one of
+them can't silently change which fields are picked or how they're weighted.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.helpers.recover_cursor_chat import FILE_KIND_PATTERN, _file_kinds
+from scripts.setup.auto_detect_schema import (
+    EXCLUDE_FIELD_PATTERN, TEXT_FIELD_NAME_PATTERN, suggest_primary_key, suggest_text_fields
+)
+from scripts.setup.intelligent_field_analysis import IntelligentFieldAnalyzer, _SEP_TRANS
+from scripts.setup.setup_local_postgres import LISTEN_ADDRESSES_RE, read_listen_addresses
+
+
+def _scalar_final_weight(name_weight, combined_weight):
+    """The original if/elif rounding, kept here as the reference."""
+    if name_weight >= 3.0:
+        if combined_weight >= 2.3:
+            return 3.0
+        elif combined_weight >= 1.5:
+            return 2.0
+        return 1.0
+    elif name_weight >= 2.0:
+        if combined_weight >= 2.0:
+            return 2.0
+        elif combined_weight >= 1.2:
+            return 1.0
+        return 0.5
+    if combined_weight >= 2.0:
+        return 2.0
+    elif combined_weight >= 1.5:
+        return 1.0
+    elif combined_weight >= 0.8:
+        return 0.5
+    return 0.0
+
+
+def _scalar_recommendation(final_weight):
+    """The original recommendation thresholds."""
+    if final_weight >= 2.5:
+        return 'CRITICAL (3.0x)'
+    elif final_weight >= 1.5:
+        return 'IMPORTANT (2.0x)'
+    elif final_weight >= 0.8:
+        return 'SUPPORTING (1.0x)'
+    return 'LOW (0.5x)'
+
+
+def test_file_kinds():
+    """FILE_KIND_PATTERN finds the same kinds as the old substring tests."""
+    names = [
+        'chat_history.json', 'conversation-1.db', 'state.vscdb', 'storage.sqlite',
+        'building_blocks.txt', 'readme.md', 'mychat.json.bak', 'workspacestorage.json',
+    ]
+    for name in names:
+        expected = set()
+        for kind in ('chat', 'conversation', 'building'):
+            if kind in name:
+                expected.add(kind)
+        if 'storage' in name or 'state' in name:
+            expected.add('storage')
+        if name.endswith('.json'):
+            expected.add('json')
+        if name.endswith(('.db', '.sqlite')):
+            expected.add('db')
+        assert _file_kinds(name) == expected, (name, _file_kinds(name), expected)
+
+    # Groups are only reported for names that match
+    assert FILE_KIND_PATTERN.search('notes.txt') is None
+
+
+def test_exclude_and_text_field_patterns():
+    """The auto-detect regexes match the same names as the old keyword lists."""
+    for name in ('user_id', 'request_uuid', 'row_guid', 'created_at', 'updated_at', 'deleted_at'):
+        assert EXCLUDE_FIELD_PATTERN.search(name), name
+    for name in ('title', 'description', 'status', 'created_by'):
+        assert not EXCLUDE_FIELD_PATTERN.search(name), name
+
+    for name in ('project_name', 'short_desc', 'body_text', 'remarks', 'comment', 'message'):
+        assert TEXT_FIELD_NAME_PATTERN.search(name), name
+    for name in ('amount', 'status', 'created_by'):
+        assert not TEXT_FIELD_NAME_PATTERN.search(name), name
+
+
+def test_suggest_text_fields():
+    """Text-typed and text-named columns are kept; ids and system fields aren't."""
+    columns = [
+        {'name': 'request_id', 'type': 'integer'},
+        {'name': 'ProjectName', 'type': 'character varying'},
+        {'name': 'remark', 'type': 'jsonb'},
+        {'name': 'created_at', 'type': 'text'},
+        {'name': 'contactid', 'type': 'text'},
+        {'name': 'amount', 'type': 'numeric'},
+    ]
+    assert suggest_text_fields(columns) == ['ProjectName', 'remark']
+
+
+def test_suggest_primary_key():
+    """Patterns are tried in order; column names keep their original case."""
+    def cols(*names):
+        return [{'name': n} for n in names]
+
+    assert suggest_primary_key(cols('id', 'Requests_ID'), 'requests') == 'Requests_ID'
+    assert suggest_primary_key(cols('name', 'ID'), 'requests') == 'ID'
+    assert suggest_primary_key(cols('name', 'RequestsId'), 'requests') == 'RequestsId'
+    assert suggest_primary_key(cols('ownerid', 'user_id'), 'requests') == 'user_id'
+    assert suggest_primary_key(cols('name', 'ownerid', 'userid'), 'requests') == 'ownerid'
+    assert suggest_primary_key(cols('name', 'title'), 'requests') == 'name'
+    assert suggest_primary_key([], 'requests') is None
+
+
+def test_split_field_name():
+    """_SEP_TRANS maps '_', '-' and '.' to spaces; names without '_' or '-' are split on camelCase instead."""
+    assert 'project_name-x.y'.translate(_SEP_TRANS) == 'project name x y'
+    assert IntelligentFieldAnalyzer.split_field_name('Project_Name') == ('project', 'name')
+    assert IntelligentFieldAnalyzer.split_field_name('contact-email.addr') == ('contact', 'email', 'addr')
+    assert IntelligentFieldAnalyzer.split_field_name('projectName') == ('project', 'name')
+    assert IntelligentFieldAnalyzer.normalize_field_name('proj_nm') == ('project', 'name')
+
+
+def test_word_class():
+    """WORD_CLASS gives the highest class when a name mixes classes."""
+    word_class = IntelligentFieldAnalyzer.WORD_CLASS
+    assert all(word_class[w] == 3 for w in IntelligentFieldAnalyzer.CRITICAL_WORDS)
+    for w in IntelligentFieldAnalyzer.IMPORTANT_WORDS - IntelligentFieldAnalyzer.CRITICAL_WORDS:
+        assert word_class[w] == 2, w
+
+    analyze = IntelligentFieldAnalyzer.analyze_field_name
+    assert analyze('status_date', 'date')[0] == 2.0
+    assert analyze('project_status', 'text')[0] == 3.0
+    assert analyze('detail_info', 'text')[0] == 1.0
+    assert analyze('keyword', 'text') == (1.0, 'Text field (no pattern match): text')
+    assert analyze('api_key', 'text')[0] == 0.0
+    assert analyze('latitude', 'numeric')[0] == 0.5
+
+
+def test_final_weight_bands():
+    """The vectorized band lookup matches the original if/elif rounding."""
+    analyzer = IntelligentFieldAnalyzer
+    name_weights = np.repeat([0.0, 0.5, 1.0, 1.9, 2.0, 2.5, 3.0], 41)
+    combined = np.tile(np.linspace(0.0, 4.0, 41), 7)
+    # Exact cutoff values must land in the upper step, as with >=
+    cutoffs = [0.8, 1.2, 1.5, 2.0, 2.3]
+    name_weights = np.concatenate([name_weights, np.repeat([1.0, 2.0, 3.0], len(cutoffs))])
+    combined = np.concatenate([combined, np.tile(cutoffs, 3)])
+
+    bands = np.digitize(name_weights, analyzer.NAME_WEIGHT_BANDS)
+    steps = (combined[:, None] >= analyzer.FINAL_WEIGHT_CUTOFFS[bands]).sum(axis=1)
+    final_weights = analyzer.FINAL_WEIGHTS[bands, steps]
+    recommendations = np.digitize(final_weights, analyzer.RECOMMENDATION_CUTOFFS)
+
+    for nw, cw, fw, rec in zip(name_weights, combined, final_weights, recommendations):
+        expected = _scalar_final_weight(nw, cw)
+        assert fw == expected, (nw, cw, fw, expected)
+        assert analyzer.RECOMMENDATIONS[rec] == _scalar_recommendation(expected), (fw, rec)
+
+
+def test_listen_addresses():
+    """Only active settings count, and the last one wins."""
+    assert LISTEN_ADDRESSES_RE.search(b"#listen_addresses = '*'") is None
+
+    cases = [
+        (b"", None),
+        (b"#listen_addresses = '*'\nport = 5432\n", None),
+        (b"listen_addresses = 'localhost'\n", 'localhost'),
+        (b"  listen_addresses='*'   # all\n", '*'),
+        (b"listen_addresses = 'localhost'\nlisten_addresses = '0.0.0.0, ::'\n", '0.0.0.0, ::'),
+        (b"listen_addresses = '*'\n#listen_addresses = 'localhost'\n", '*'),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        conf_path = os.path.join(tmp, 'postgresql.conf')
+        for content, expected in cases:
+            with open(conf_path, 'wb') as f:
+                f.write(content)
+            assert read_listen_addresses(conf_path) == expected, (content, expected)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✓ {name}")
+    print("\n✅ All helper checks passed")